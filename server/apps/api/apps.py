@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 
 class ApiConfig(AppConfig):
-    name = 'api'
+    name = 'apps.api'
+
+    def ready(self):
+        from . import signals  # noqa: F401
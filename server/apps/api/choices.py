@@ -1,18 +1,13 @@
 # This file saves constant list for choice fields options.
 # 알파벳 순으로 정렬.
-import json
+from .location_registry import get_location_registry
 
 GENDER_CHOICES = [
     ('M', 'M'),
     ('W', 'W'),
 ]
 
-with open('apps/api/locations/data.json') as json_file:
-    data = json.load(json_file)
-    
-LOCATION_CHOICES = []
-for row in data:
-    LOCATION_CHOICES.append((int(row), data[row]['full_address']))
+LOCATION_CHOICES = get_location_registry().choices()
 
 LOWER_CATEGORY_CHOICES = [
     ('반팔티셔츠', '반팔티셔츠'),
@@ -0,0 +1,172 @@
+# 해외 도시(cities_20000.json) 검색용 인덱스.
+from array import array
+from bisect import bisect_left, bisect_right
+import hashlib
+import json
+import logging
+import pickle
+import threading
+import unicodedata
+
+from .location_registry import LOCATIONS_DIR
+from .search_index import NgramIndex
+
+CITY_DATA_PATH = LOCATIONS_DIR / 'cities_20000.json'
+CITY_INDEX_PATH = LOCATIONS_DIR / 'cities_20000.idx'
+
+logger = logging.getLogger(__name__)
+
+# 인덱스 구조가 바뀌면 올려서 기존 artifact를 무효화한다.
+CITY_INDEX_VERSION = 1
+
+
+def normalize_city_name(name):
+    """
+    case- and accent-insensitive form of the city name
+    ex) 'Kozáni' -> 'kozani'
+    """
+    decomposed = unicodedata.normalize('NFKD', name)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def _source_digest(path):
+    with open(path, 'rb') as source_file:
+        return hashlib.sha1(source_file.read()).hexdigest()
+
+
+class CityIndex:
+    """
+    Compact index over global cities.
+    name -> ids hash map, normalized name -> ids hash map,
+    정렬된 normalized name 배열(prefix 검색), normalized name n-gram 인덱스(부분 검색)
+    """
+    def __init__(self, ids, names):
+        self._ids = array('l', ids)
+        self._names = list(names)
+
+        normalized = [normalize_city_name(name) for name in self._names]
+
+        self._by_name = {}
+        self._by_normalized = {}
+        for position, name in enumerate(self._names):
+            self._by_name.setdefault(name, []).append(position)
+            self._by_normalized.setdefault(normalized[position], []).append(position)
+
+        order = sorted(range(len(normalized)), key=normalized.__getitem__)
+        self._sorted_normalized = [normalized[position] for position in order]
+        self._sorted_positions = array('l', order)
+
+        self._ngrams = NgramIndex(normalized)
+
+    @classmethod
+    def from_json(cls, path=CITY_DATA_PATH):
+        with open(path, 'rt', encoding='UTF-8') as json_file:
+            data = json.load(json_file)
+        return cls([city['city_id'] for city in data], [city['city_name'] for city in data])
+
+    @classmethod
+    def load(cls, path=CITY_INDEX_PATH, source_path=CITY_DATA_PATH):
+        """
+        loads the prebuilt artifact if it matches the source json,
+        otherwise builds the index from the json file
+        """
+        try:
+            with open(path, 'rb') as index_file:
+                version, digest, index = pickle.load(index_file)
+            if version == CITY_INDEX_VERSION and digest == _source_digest(source_path):
+                return index
+        except FileNotFoundError:
+            pass
+        # 클래스가 바뀐 뒤의 오래된 artifact는 AttributeError, ImportError, TypeError 등을 낸다.
+        except Exception:
+            logger.warning('failed to load city index %s, building from %s', path, source_path, exc_info=True)
+
+        return cls.from_json(source_path)
+
+    @classmethod
+    def build(cls, path=CITY_INDEX_PATH, source_path=CITY_DATA_PATH):
+        """
+        builds the index from the json file and writes the artifact
+        """
+        index = cls.from_json(source_path)
+        with open(path, 'wb') as index_file:
+            pickle.dump((CITY_INDEX_VERSION, _source_digest(source_path), index),
+                        index_file, protocol=pickle.HIGHEST_PROTOCOL)
+        return index
+
+    def __len__(self):
+        return len(self._names)
+
+    def city(self, position):
+        """
+        returns (city_id, city_name) of the position
+        """
+        return (self._ids[position], self._names[position])
+
+    def find_ids(self, city_name):
+        """
+        returns city ids of the exact name,
+        falls back to case- and accent-insensitive match
+        """
+        positions = self._by_name.get(city_name)
+        if positions is None:
+            positions = self._by_normalized.get(normalize_city_name(city_name), ())
+        return [self._ids[position] for position in positions]
+
+    def _prefix_positions(self, query):
+        start = bisect_left(self._sorted_normalized, query)
+        end = bisect_right(self._sorted_normalized, query + '\U0010ffff', start)
+        return self._sorted_positions[start:end]
+
+    def search(self, query, offset=0, limit=None):
+        """
+        returns (count, positions) of cities whose name contains query.
+        순위 : 정확히 일치 > 대소문자/악센트 무시 일치 > 접두 일치 > 부분 일치
+        """
+        if limit is None:
+            limit = len(self._names)
+        stop = offset + limit
+
+        if len(query) == 0:
+            return (len(self._names), list(range(offset, min(stop, len(self._names)))))
+
+        normalized = normalize_city_name(query)
+        substring = self._ngrams.find(normalized)
+        ranked = (
+            self._by_name.get(query, ()),
+            self._by_normalized.get(normalized, ()),
+            self._prefix_positions(normalized),
+            substring,
+        )
+
+        results = []
+        seen = set()
+        for positions in ranked:
+            for position in positions:
+                if position in seen:
+                    continue
+                if len(seen) >= stop:
+                    return (len(substring), results)
+                if len(seen) >= offset:
+                    results.append(position)
+                seen.add(position)
+
+        return (len(substring), results)
+
+
+_city_index = None
+_city_index_lock = threading.Lock()
+
+
+def get_city_index():
+    """
+    returns the process-wide CityIndex
+    """
+    global _city_index
+
+    if _city_index is None:
+        with _city_index_lock:
+            if _city_index is None:
+                _city_index = CityIndex.load()
+
+    return _city_index
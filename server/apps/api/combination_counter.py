@@ -0,0 +1,198 @@
+# (weather_type, 하위 카테고리 조합) -> 코디 수 카운터.
+# 리뷰/코디가 바뀔 때 signals.py에서 증감하고, reconcile_combination_counts 명령으로 전체 재계산한다.
+from collections import Counter
+from itertools import groupby
+import json
+from operator import itemgetter
+import random
+from django.conf import settings
+from django.db import transaction
+
+from .models import ClothesSet, ClothesSetReview, CombinationCount, CombinationCountMember
+
+# 추천에 사용하는 리뷰(날씨 적절성) 점수
+RECOMMEND_REVIEW = 3
+
+# recount에서 한 번에 INSERT 하는 행 수
+BULK_BATCH_SIZE = 500
+
+
+def iter_combinations(clothes_sets):
+    """
+    yields (clothes_set_id, image_url, combination) of the ClothesSet queryset with one joined query
+    combination : 정렬된 하위 카테고리를 '-'로 연결, ex) '반팔-청바지'
+    """
+    rows = clothes_sets.order_by('id').values_list('id', 'image_url', 'clothes__category__lower_category')
+
+    for clothes_set_id, clothes_set_rows in groupby(rows.iterator(), key=itemgetter(0)):
+        categories = set()
+        for _, image_url, lower_category in clothes_set_rows:
+            # 옷이 없거나 카테고리가 없는 옷은 조합에서 제외
+            if lower_category is not None:
+                categories.add(lower_category)
+        yield (clothes_set_id, image_url, '-'.join(sorted(categories)))
+
+
+def _lock_clothes_set(clothes_set_id):
+    # 같은 코디의 카운터 갱신을 직렬화한다, 코디가 없으면 False
+    return ClothesSet.objects.select_for_update().filter(pk=clothes_set_id).exists()
+
+
+def _increment(weather_type, combination, image_url):
+    counter, _ = CombinationCount.objects.get_or_create(weather_type=weather_type, combination=combination)
+    counter = CombinationCount.objects.select_for_update().get(pk=counter.pk)
+    counter.count += 1
+
+    # reservoir sampling : count 번째 이미지는 size / count 확률로 reservoir에 들어간다.
+    images = json.loads(counter.images)
+    if len(images) < settings.COMBINATION_IMAGE_RESERVOIR_SIZE:
+        images.append(image_url)
+    else:
+        i = random.randrange(counter.count)
+        if i < len(images):
+            images[i] = image_url
+    counter.images = json.dumps(images)
+
+    counter.save(update_fields=['count', 'images'])
+
+
+def _decrement(weather_type, combination, image_url):
+    counter = CombinationCount.objects.select_for_update().filter(
+        weather_type=weather_type, combination=combination).first()
+    if counter is None:
+        return
+
+    counter.count = max(0, counter.count - 1)
+    images = [url for url in json.loads(counter.images) if url != image_url]
+
+    # 빠진 자리는 reservoir 밖의 코디 중 무작위로 채워 균등 표본을 유지한다(member는 미리 삭제/이동되어 있어야 한다).
+    missing = min(settings.COMBINATION_IMAGE_RESERVOIR_SIZE, counter.count) - len(images)
+    if missing > 0:
+        images += (CombinationCountMember.objects
+                   .filter(weather_type=weather_type, combination=combination)
+                   .exclude(image_url__in=images)
+                   .order_by('?').values_list('image_url', flat=True)[:missing])
+    counter.images = json.dumps(images)
+
+    counter.save(update_fields=['count', 'images'])
+
+
+def _replace_image(weather_type, combination, old_image_url, image_url):
+    counter = CombinationCount.objects.select_for_update().filter(
+        weather_type=weather_type, combination=combination).first()
+    if counter is None:
+        return
+
+    counter.images = json.dumps([image_url if url == old_image_url else url for url in json.loads(counter.images)])
+    counter.save(update_fields=['images'])
+
+
+def add_clothes_set(clothes_set_id, weather_type):
+    """
+    counts the clothes set on the weather_type, once per clothes set
+    """
+    with transaction.atomic():
+        if not _lock_clothes_set(clothes_set_id):
+            return
+        if CombinationCountMember.objects.filter(weather_type=weather_type, clothes_set_id=clothes_set_id).exists():
+            return
+
+        _, image_url, combination = next(iter_combinations(ClothesSet.objects.filter(pk=clothes_set_id)))
+        CombinationCountMember.objects.create(weather_type=weather_type, clothes_set_id=clothes_set_id,
+                                              combination=combination, image_url=image_url)
+        _increment(weather_type, combination, image_url)
+
+
+def remove_clothes_set(clothes_set_id, weather_type):
+    """
+    uncounts the clothes set on the weather_type if none of its reviews counts it anymore
+    """
+    with transaction.atomic():
+        _lock_clothes_set(clothes_set_id)
+        if ClothesSetReview.objects.filter(clothes_set_id=clothes_set_id, weather_type=weather_type,
+                                           review=RECOMMEND_REVIEW).exists():
+            return
+
+        member = CombinationCountMember.objects.filter(weather_type=weather_type, clothes_set_id=clothes_set_id).first()
+        if member is None:
+            return
+
+        member.delete()
+        _decrement(weather_type, member.combination, member.image_url)
+
+
+def refresh_clothes_set(clothes_set_id):
+    """
+    moves the counted clothes set to its current combination and image_url
+    after its clothes or image changed
+    """
+    with transaction.atomic():
+        if not _lock_clothes_set(clothes_set_id):
+            return
+        members = list(CombinationCountMember.objects.filter(clothes_set_id=clothes_set_id))
+        if not members:
+            return
+
+        _, image_url, combination = next(iter_combinations(ClothesSet.objects.filter(pk=clothes_set_id)))
+        for member in members:
+            if member.combination == combination and member.image_url == image_url:
+                continue
+            old_combination, old_image_url = member.combination, member.image_url
+            member.combination = combination
+            member.image_url = image_url
+            member.save(update_fields=['combination', 'image_url'])
+
+            # 조합이 같으면 reservoir의 url만 바꾼다.
+            if old_combination == combination:
+                _replace_image(member.weather_type, combination, old_image_url, image_url)
+            else:
+                _decrement(member.weather_type, old_combination, old_image_url)
+                _increment(member.weather_type, combination, image_url)
+
+
+def recount(dry_run=False):
+    """
+    recomputes every counter from the reviews, rewrites the counters unless dry_run
+    returns drift {(weather_type, combination): (stored count, recomputed count)}
+    """
+    reviews = ClothesSetReview.objects.filter(review=RECOMMEND_REVIEW)
+    combinations = {
+        clothes_set_id: (image_url, combination)
+        for clothes_set_id, image_url, combination
+        in iter_combinations(ClothesSet.objects.filter(pk__in=reviews.values('clothes_set')))
+    }
+
+    members = []
+    for weather_type, clothes_set_id in reviews.order_by().values_list('weather_type', 'clothes_set').distinct():
+        image_url, combination = combinations[clothes_set_id]
+        members.append(CombinationCountMember(weather_type=weather_type, clothes_set_id=clothes_set_id,
+                                              combination=combination, image_url=image_url))
+
+    counts = Counter((member.weather_type, member.combination) for member in members)
+    stored = {(weather_type, combination): count for weather_type, combination, count
+              in CombinationCount.objects.filter(count__gt=0).values_list('weather_type', 'combination', 'count')}
+    drift = {key: (stored.get(key, 0), counts.get(key, 0))
+             for key in set(stored) | set(counts) if stored.get(key, 0) != counts.get(key, 0)}
+
+    if dry_run:
+        return drift
+
+    images = {}
+    for member in members:
+        images.setdefault((member.weather_type, member.combination), []).append(member.image_url)
+
+    size = settings.COMBINATION_IMAGE_RESERVOIR_SIZE
+    counters = [
+        CombinationCount(weather_type=weather_type, combination=combination, count=count,
+                         images=json.dumps(random.sample(images[(weather_type, combination)],
+                                                         min(size, count))))
+        for (weather_type, combination), count in counts.items()
+    ]
+
+    with transaction.atomic():
+        CombinationCountMember.objects.all().delete()
+        CombinationCount.objects.all().delete()
+        CombinationCountMember.objects.bulk_create(members, batch_size=BULK_BATCH_SIZE)
+        CombinationCount.objects.bulk_create(counters, batch_size=BULK_BATCH_SIZE)
+
+    return drift
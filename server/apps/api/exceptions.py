@@ -1,2 +1,6 @@
 class S3FileError(Exception):
     pass
+
+
+class ImageDecodeError(ValueError):
+    pass
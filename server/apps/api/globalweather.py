@@ -6,16 +6,13 @@ import urllib
 import pprint
 from urllib.request import urlopen
 
+from .city_index import get_city_index
+
 ServiceKey = settings.GLOBAL_WEATHER_API_KEY
 
 def find_city_id(city_name):
-    with open('apps/api/locations/cities_20000.json', 'rt', encoding='UTF8') as json_file:
-        json_data = json.load(json_file)
-    city_id = 0
-    for i in json_data:
-        if i['city_name'] == city_name:
-            city_id = i['city_id']
-            break
+    city_ids = get_city_index().find_ids(city_name)
+    city_id = city_ids[0] if city_ids else 0
     
     return city_id
 
@@ -0,0 +1,114 @@
+# 업로드 이미지 디코딩 : 헤더로 크기를 확인하고, 큰 JPEG는 축소 해상도로 바로 디코딩한다.
+# 헤더로 크기를 알 수 없는 형식(JPEG, PNG, WebP 외)은 디코딩 전에 거부한다.
+import cv2.cv2 as cv2
+from django.conf import settings
+import numpy as np
+import struct
+
+from .exceptions import ImageDecodeError
+
+# 축소 비율 -> 축소 디코딩 flag(JPEG만 디코딩 단계에서 축소된다)
+REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+# JPEG SOF(Start Of Frame) marker, DHT(C4), JPG(C8), DAC(CC) 제외
+JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _jpeg_size(data):
+    i = 2
+    while i + 9 < len(data):
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        # padding, standalone marker
+        if marker == 0xFF:
+            i += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:
+            i += 2
+            continue
+        if marker in JPEG_SOF_MARKERS:
+            height, width = struct.unpack('>HH', data[i + 5:i + 9])
+            return (width, height)
+        i += 2 + struct.unpack('>H', data[i + 2:i + 4])[0]
+    return None
+
+
+def _webp_size(data):
+    chunk = data[12:16]
+    # lossy : frame header의 14bit 가로/세로
+    if chunk == b'VP8 ' and data[23:26] == b'\x9d\x01\x2a':
+        width, height = struct.unpack('<HH', data[26:30])
+        return (width & 0x3FFF, height & 0x3FFF)
+    # lossless : signature(0x2F) 뒤 14bit씩 (가로 - 1), (세로 - 1)
+    if chunk == b'VP8L' and data[20:21] == b'\x2f' and len(data) >= 25:
+        bits = struct.unpack('<I', data[21:25])[0]
+        return ((bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1)
+    # extended : 24bit씩 (가로 - 1), (세로 - 1)
+    if chunk == b'VP8X' and len(data) >= 30:
+        return (int.from_bytes(data[24:27], 'little') + 1, int.from_bytes(data[27:30], 'little') + 1)
+    return None
+
+
+def image_size(data):
+    """
+    returns (format, width, height) read from the header, None if unknown
+    ex) ('jpeg', 4032, 3024)
+    """
+    if data[:8] == b'\x89PNG\r\n\x1a\n' and data[12:16] == b'IHDR':
+        width, height = struct.unpack('>II', data[16:24])
+        return ('png', width, height)
+
+    if data[:2] == b'\xff\xd8':
+        size = _jpeg_size(data)
+        if size is not None:
+            return ('jpeg',) + size
+
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        size = _webp_size(data)
+        if size is not None:
+            return ('webp',) + size
+
+    return None
+
+
+def decode_image(data, max_width):
+    """
+    decodes image bytes to BGR image at most max_width wide
+    raises ImageDecodeError if the data is too large, not an image or of an unsupported format
+    """
+    if len(data) > settings.IMAGE_DECODE_MAX_BYTES:
+        raise ImageDecodeError('image is larger than %d bytes' % settings.IMAGE_DECODE_MAX_BYTES)
+
+    # 크기를 확인하지 못한 채 디코딩하면 전체 해상도만큼 메모리를 쓰므로 거부한다.
+    size = image_size(data)
+    if size is None:
+        raise ImageDecodeError('unsupported image format')
+
+    image_format, width, height = size
+    if width * height > settings.IMAGE_DECODE_MAX_PIXELS:
+        raise ImageDecodeError('image is larger than %d pixels' % settings.IMAGE_DECODE_MAX_PIXELS)
+
+    # 축소 후에도 max_width 이상이 되는 가장 큰 비율로 디코딩(EXIF 회전을 고려해 짧은 변 기준)
+    flag = cv2.IMREAD_COLOR
+    if image_format == 'jpeg':
+        for ratio, reduced_flag in REDUCED_FLAGS:
+            if min(width, height) >= max_width * ratio:
+                flag = reduced_flag
+                break
+
+    # np.frombuffer : 복사 없이 bytes를 그대로 사용
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), flag)
+    if image is None:
+        raise ImageDecodeError('not an image')
+
+    if image.shape[1] > max_width:
+        ratio = float(max_width) / image.shape[1]
+        dim = (max_width, int(image.shape[0] * ratio))
+        image = cv2.resize(image, dim, interpolation=cv2.INTER_AREA)
+
+    return image
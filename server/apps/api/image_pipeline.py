@@ -0,0 +1,85 @@
+# 옷 이미지 분석 파이프라인 : 분류(endpoint 요청)와 배경 제거 + S3 업로드를 동시에 실행한다.
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+import logging
+import threading
+
+from .storage import get_image_promoter, parse_image_url
+from .utils import (
+    execute_inference,
+    get_categories_from_predictions,
+    image_to_tensor,
+    remove_background,
+    save_image_s3
+)
+
+logger = logging.getLogger(__name__)
+
+_image_executor = None
+_image_executor_lock = threading.Lock()
+
+
+def get_image_executor():
+    """
+    returns the process-wide worker pool of image stages,
+    OpenCV와 네트워크 I/O는 GIL을 놓으므로 스레드로 충분하다.
+    """
+    global _image_executor
+
+    if _image_executor is None:
+        with _image_executor_lock:
+            if _image_executor is None:
+                _image_executor = ThreadPoolExecutor(max_workers=settings.IMAGE_PIPELINE_WORKERS,
+                                                     thread_name_prefix='image-pipeline')
+
+    return _image_executor
+
+
+def classify(image):
+    """
+    returns (upper, lower) category of the image
+    """
+    return get_categories_from_predictions(execute_inference(image_to_tensor(image)))
+
+
+def segment_and_upload(image, prefix):
+    """
+    removes background of the image and uploads it, returns the temp image url
+    """
+    return save_image_s3(remove_background(image), prefix)
+
+
+def discard_upload(upload, prefix):
+    """
+    cancels the upload of a failed request,
+    이미 시작된 업로드는 끝날 때까지 기다린 뒤 temp 이미지를 삭제 queue에 넣는다.
+    """
+    if upload.cancel():
+        return
+
+    try:
+        image_url = upload.result()
+    except Exception:
+        logger.warning('failed to upload image of a failed request', exc_info=True)
+        return
+
+    bucket_name, temp_key, _ = parse_image_url(image_url, prefix)
+    get_image_promoter().deleter.delete(bucket_name, temp_key)
+
+
+def analyze_clothes_image(image, prefix='clothes'):
+    """
+    returns (upper, lower, image_url) of the image,
+    latency는 두 단계의 합이 아니라 max(분류, 배경 제거 + 업로드)
+    """
+    upload = get_image_executor().submit(segment_and_upload, image, prefix)
+
+    # 분류는 요청 스레드에서 실행, 업로드 결과와 합친다.
+    try:
+        upper, lower = classify(image)
+    except Exception:
+        discard_upload(upload, prefix)
+        raise
+    image_url = upload.result()
+
+    return (upper, lower, image_url)
@@ -0,0 +1,157 @@
+# 옷 분류 모델(SageMaker endpoint) 추론 클라이언트.
+import boto3
+from botocore.config import Config
+import cv2.cv2 as cv2
+from django.conf import settings
+import io
+import json
+import numpy as np
+import threading
+import time
+
+from .choices import LOWER_CATEGORY_CHOICES
+
+
+def encode_json(tensor):
+    """
+    float lists, ex) [[[[0.1, 0.2, 0.3], ...]]]
+    """
+    return json.dumps(tensor.tolist())
+
+
+def encode_npy(tensor):
+    """
+    float32 .npy bytes of the whole N x 224 x 224 x 3 tensor
+    """
+    buffer = io.BytesIO()
+    np.save(buffer, np.asarray(tensor, dtype=np.float32), allow_pickle=False)
+    return buffer.getvalue()
+
+
+def encode_jpeg(tensor):
+    """
+    JPEG bytes of the resized 224 x 224 image, the endpoint normalizes it again.
+    한 요청에 이미지 한 장만 보낼 수 있다.
+    """
+    image = np.clip(tensor[0] * 255 + 0.5, 0, 255).astype(np.uint8)
+    image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+    _, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, settings.INFERENCE_JPEG_QUALITY])
+    return buffer.tobytes()
+
+
+# payload format -> (content type, encoder, 여러 이미지를 한 요청에 보낼 수 있는지)
+PAYLOAD_FORMATS = {
+    'json': ('application/json', encode_json, True),
+    'npy': ('application/x-npy', encode_npy, True),
+    'jpeg': ('image/jpeg', encode_jpeg, False),
+}
+
+
+class SageMakerInferenceClient:
+    """
+    Client of the SageMaker runtime endpoint.
+    boto3 client는 thread-safe 하므로 프로세스 하나에 한 개를 만들어
+    자격 증명, connection pool(keep-alive)을 요청 간에 재사용한다.
+    """
+    def __init__(self, endpoint_name=None, endpoint_url=None, region_name=None, config=None, payload_format=None):
+        self.endpoint_name = endpoint_name or settings.SAGEMAKER_ENDPOINT_NAME
+        self.payload_format = payload_format or settings.INFERENCE_PAYLOAD_FORMAT
+        if self.payload_format not in PAYLOAD_FORMATS:
+            raise ValueError('unknown payload format : %s' % self.payload_format)
+        # False면 InferenceBatcher를 거치지 않는다(모아도 이미지마다 요청하므로 대기만 늘어난다).
+        self.batchable = PAYLOAD_FORMATS[self.payload_format][2]
+
+        if config is None:
+            config = Config(
+                max_pool_connections=settings.SAGEMAKER_MAX_POOL_CONNECTIONS,
+                connect_timeout=settings.SAGEMAKER_CONNECT_TIMEOUT,
+                read_timeout=settings.SAGEMAKER_READ_TIMEOUT,
+                retries={'max_attempts': settings.SAGEMAKER_MAX_ATTEMPTS, 'mode': 'standard'},
+            )
+
+        session = boto3.session.Session(aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                                        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY)
+        self.client = session.client('sagemaker-runtime',
+                                     region_name=region_name or settings.SAGEMAKER_REGION,
+                                     endpoint_url=endpoint_url or settings.SAGEMAKER_ENDPOINT_URL or None,
+                                     config=config)
+
+    def invoke(self, body, content_type='application/json', accept='application/json'):
+        """
+        sends body to the endpoint, returns the response body bytes
+        """
+        response = self.client.invoke_endpoint(EndpointName=self.endpoint_name, Body=body,
+                                               ContentType=content_type, Accept=accept)
+        return response['Body'].read()
+
+    def predict(self, tensor):
+        """
+        returns predictions of the image tensor(N x 224 x 224 x 3)
+        ex) {'predictions': [[0.01, 0.9, ...]]}
+        """
+        content_type, encode, batchable = PAYLOAD_FORMATS[self.payload_format]
+
+        if not batchable and len(tensor) > 1:
+            predictions = []
+            for i in range(len(tensor)):
+                predictions.extend(self.predict(tensor[i:i + 1])['predictions'])
+            return {'predictions': predictions}
+
+        return json.loads(self.invoke(encode(tensor), content_type=content_type))
+
+
+class StubInferenceClient:
+    """
+    Local stand-in for the endpoint used by tests and benchmarks.
+    모든 이미지를 category_index로 분류하고, 요청마다 latency + 이미지당 per_image_latency(초)만큼 기다린다.
+    """
+    def __init__(self, category_index=0, latency=0.0, per_image_latency=0.0, batchable=True):
+        self.category_index = category_index
+        self.batchable = batchable
+        self.latency = latency
+        self.per_image_latency = per_image_latency
+        self.calls = 0
+
+    def predict(self, tensor):
+        self.calls += 1
+        delay = self.latency + self.per_image_latency * len(tensor)
+        if delay:
+            time.sleep(delay)
+
+        prediction = [0.0] * len(LOWER_CATEGORY_CHOICES)
+        prediction[self.category_index] = 1.0
+
+        return {'predictions': [list(prediction) for _ in range(len(tensor))]}
+
+
+INFERENCE_CLIENTS = {
+    'sagemaker': SageMakerInferenceClient,
+    'stub': StubInferenceClient,
+}
+
+_inference_client = None
+_inference_client_lock = threading.Lock()
+
+
+def get_inference_client():
+    """
+    returns the process-wide inference client, created on first use
+    """
+    global _inference_client
+
+    if _inference_client is None:
+        with _inference_client_lock:
+            if _inference_client is None:
+                _inference_client = INFERENCE_CLIENTS[settings.INFERENCE_CLIENT]()
+
+    return _inference_client
+
+
+def set_inference_client(client):
+    """
+    replaces the process-wide inference client, None to recreate it from settings
+    """
+    global _inference_client
+
+    with _inference_client_lock:
+        _inference_client = client
@@ -0,0 +1,109 @@
+# 동시에 들어온 추론 요청을 모아 한 번에 보내는 micro-batching 큐.
+from concurrent.futures import Future, ThreadPoolExecutor
+from django.conf import settings
+import numpy as np
+import queue
+import threading
+import time
+
+from .inference import get_inference_client
+
+
+class InferenceBatcher:
+    """
+    Collects concurrent predict calls for up to max_wait seconds or max_batch images,
+    sends them as one batched tensor and fans the predictions back out.
+    concurrency : 동시에 endpoint로 보내는 batch 수
+    timeout : 결과를 기다리는 최대 시간(초), 기본값은 endpoint 요청의 최대 시도 시간
+    """
+    def __init__(self, client=None, max_batch=None, max_wait=None, concurrency=None, timeout=None):
+        self.client = client
+        self.max_batch = max_batch or settings.INFERENCE_MAX_BATCH
+        self.max_wait = max_wait if max_wait is not None else settings.INFERENCE_MAX_WAIT
+        self.concurrency = concurrency or settings.INFERENCE_BATCH_CONCURRENCY
+        self.timeout = timeout or self.max_wait + settings.SAGEMAKER_MAX_ATTEMPTS * (
+            settings.SAGEMAKER_CONNECT_TIMEOUT + settings.SAGEMAKER_READ_TIMEOUT)
+
+        self._queue = queue.Queue()
+        self._worker = None
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def predict(self, tensor):
+        """
+        returns predictions of the image tensor, blocks until its batch is answered,
+        raises concurrent.futures.TimeoutError after timeout seconds
+        """
+        # 이미지마다 요청하는 client(ex. jpeg payload)는 모으지 않고 요청 스레드에서 바로 보낸다.
+        client = self.client or get_inference_client()
+        if not getattr(client, 'batchable', True):
+            return client.predict(tensor)
+
+        self._start()
+
+        future = Future()
+        self._queue.put((tensor, future))
+
+        return future.result(timeout=self.timeout)
+
+    def _start(self):
+        # 첫 요청 때 worker 스레드 생성(fork 이후에 만들어지도록)
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.concurrency)
+                    worker = threading.Thread(target=self._collect, name='inference-batcher', daemon=True)
+                    worker.start()
+                    self._worker = worker
+
+    def _collect(self):
+        while True:
+            batch = [self._queue.get()]
+            size = len(batch[0][0])
+            deadline = time.monotonic() + self.max_wait
+
+            while size < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            self._executor.submit(self._send, batch)
+
+    def _send(self, batch):
+        client = self.client or get_inference_client()
+
+        try:
+            predictions = client.predict(np.concatenate([tensor for tensor, _ in batch]))['predictions']
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        offset = 0
+        for tensor, future in batch:
+            future.set_result({'predictions': predictions[offset:offset + len(tensor)]})
+            offset += len(tensor)
+
+
+_inference_batcher = None
+_inference_batcher_lock = threading.Lock()
+
+
+def get_inference_batcher():
+    """
+    returns the process-wide InferenceBatcher
+    """
+    global _inference_batcher
+
+    if _inference_batcher is None:
+        with _inference_batcher_lock:
+            if _inference_batcher is None:
+                _inference_batcher = InferenceBatcher()
+
+    return _inference_batcher
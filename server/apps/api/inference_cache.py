@@ -0,0 +1,138 @@
+# 옷 분류 결과 캐시 : 같은 이미지를 다시 올리면 SageMaker, S3 없이 바로 반환한다.
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+import hashlib
+import threading
+import time
+
+
+def image_cache_key(user_id, image):
+    """
+    returns the cache key of the decoded(resized) image uploaded by the user
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(str(image.shape).encode())
+    digest.update(image.tobytes())
+
+    return '%s:%s' % (user_id, digest.hexdigest())
+
+
+class LocMemClassificationCache:
+    """
+    Process-local LRU cache with TTL.
+    value : inference 결과 dict, 'image_url' 키로 discard_url 가능
+    """
+    def __init__(self, max_size=None, ttl=None):
+        self.max_size = max_size or settings.CLASSIFICATION_CACHE_SIZE
+        self.ttl = ttl or settings.CLASSIFICATION_CACHE_TTL
+
+        self._entries = OrderedDict()
+        self._keys_by_url = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._keys_by_url[value['image_url']] = key
+
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def discard_url(self, image_url):
+        """
+        removes the entry of the image url, ex) after the temp image is moved to saved
+        """
+        with self._lock:
+            key = self._keys_by_url.get(image_url)
+            if key is not None:
+                self._remove(key)
+
+    def _remove(self, key):
+        _, value = self._entries.pop(key)
+        self._keys_by_url.pop(value['image_url'], None)
+
+
+class DjangoClassificationCache:
+    """
+    Cache on a Django cache backend(CACHES), shared between processes.
+    """
+    KEY_PREFIX = 'clothes-inference:'
+    URL_KEY_PREFIX = 'clothes-inference-url:'
+
+    def __init__(self, alias=None, ttl=None):
+        self.cache = caches[alias or settings.CLASSIFICATION_CACHE_ALIAS]
+        self.ttl = ttl or settings.CLASSIFICATION_CACHE_TTL
+
+    def _url_key(self, image_url):
+        return self.URL_KEY_PREFIX + hashlib.blake2b(image_url.encode(), digest_size=20).hexdigest()
+
+    def get(self, key):
+        return self.cache.get(self.KEY_PREFIX + key)
+
+    def set(self, key, value):
+        self.cache.set_many({
+            self.KEY_PREFIX + key: value,
+            self._url_key(value['image_url']): key,
+        }, self.ttl)
+
+    def discard_url(self, image_url):
+        url_key = self._url_key(image_url)
+        key = self.cache.get(url_key)
+        if key is not None:
+            self.cache.delete_many([self.KEY_PREFIX + key, url_key])
+
+
+class NullClassificationCache:
+    """
+    Cache disabled.
+    """
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def discard_url(self, image_url):
+        pass
+
+
+CLASSIFICATION_CACHES = {
+    'locmem': LocMemClassificationCache,
+    'django': DjangoClassificationCache,
+    'none': NullClassificationCache,
+}
+
+_classification_cache = None
+_classification_cache_lock = threading.Lock()
+
+
+def get_classification_cache():
+    """
+    returns the process-wide classification cache
+    """
+    global _classification_cache
+
+    if _classification_cache is None:
+        with _classification_cache_lock:
+            if _classification_cache is None:
+                _classification_cache = CLASSIFICATION_CACHES[settings.CLASSIFICATION_CACHE]()
+
+    return _classification_cache
@@ -0,0 +1,170 @@
+# 국내 지역 코드(location) 데이터를 프로세스당 한 번만 읽어 공유하는 모듈.
+from array import array
+from bisect import bisect_left
+import json
+from pathlib import Path
+import sys
+import threading
+
+from .search_index import NgramIndex
+
+LOCATIONS_DIR = Path(__file__).parent / 'locations'
+LOCATION_DATA_PATH = LOCATIONS_DIR / 'data.json'
+
+
+class LocationRegistry:
+    """
+    In-memory registry of domestic locations.
+    location code -> full_address / KMA grid cell (x, y)
+    """
+    def __init__(self, data):
+        size = max(int(code) for code in data) + 1
+
+        self._addresses = [None] * size
+        self._x = array('H', bytes(2 * size))
+        self._y = array('H', bytes(2 * size))
+        self._by_address = {}
+        self._by_cell = {}
+
+        for code in sorted(int(code) for code in data):
+            row = data[str(code)]
+            address = sys.intern(row['full_address'])
+            cell = (int(row['x']), int(row['y']))
+
+            self._addresses[code] = address
+            self._x[code], self._y[code] = cell
+            self._by_address.setdefault(address, code)
+            self._by_cell.setdefault(cell, []).append(code)
+
+        self._codes = tuple(code for code in range(size) if self._addresses[code] is not None)
+        self._search_index = None
+        self._search_index_lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path=LOCATION_DATA_PATH):
+        with open(path, encoding='UTF-8') as json_file:
+            return cls(json.load(json_file))
+
+    def __len__(self):
+        return len(self._codes)
+
+    def __contains__(self, code):
+        try:
+            code = int(code)
+        except (TypeError, ValueError):
+            return False
+        return 0 <= code < len(self._addresses) and self._addresses[code] is not None
+
+    def codes(self):
+        """
+        returns every location code in ascending order
+        """
+        return self._codes
+
+    def address(self, code):
+        """
+        returns full_address of the location code
+        ex) 1 -> '서울특별시 종로구'
+        """
+        code = int(code)
+        if code not in self:
+            raise KeyError(code)
+        return self._addresses[code]
+
+    def grid(self, code):
+        """
+        returns KMA grid cell (x, y) of the location code
+        ex) 1 -> (60, 127)
+        """
+        code = int(code)
+        if code not in self:
+            raise KeyError(code)
+        return (self._x[code], self._y[code])
+
+    def code_for_address(self, address):
+        """
+        returns location code of the full_address, None if it does not exist
+        """
+        return self._by_address.get(address)
+
+    def codes_in_cell(self, x, y):
+        """
+        returns location codes sharing the grid cell (x, y)
+        """
+        return tuple(self._by_cell.get((int(x), int(y)), ()))
+
+    def cells(self):
+        """
+        returns every distinct grid cell (x, y) in the order it first appears
+        """
+        return list(self._by_cell)
+
+    def search(self, query, offset=0, limit=None, prefix=False):
+        """
+        searches full_address, returns (count, location codes)
+        """
+        if self._search_index is None:
+            with self._search_index_lock:
+                if self._search_index is None:
+                    self._search_index = LocationSearchIndex(
+                        self._codes, [self._addresses[code] for code in self._codes])
+
+        return self._search_index.search(query, offset, limit, prefix)
+
+    def choices(self):
+        """
+        returns (code, full_address) pairs for choice fields
+        """
+        return [(code, self._addresses[code]) for code in self._codes]
+
+
+class LocationSearchIndex:
+    """
+    Search index over full_address.
+    n-gram 인덱스(부분 검색) + 정렬된 주소 배열(접두 검색)
+    """
+    def __init__(self, codes, addresses):
+        self._codes = array('H', codes)
+        self._ngrams = NgramIndex(addresses)
+
+        order = sorted(range(len(addresses)), key=addresses.__getitem__)
+        self._sorted_addresses = [addresses[position] for position in order]
+        self._sorted_positions = array('H', order)
+
+    def search(self, query, offset=0, limit=None, prefix=False):
+        """
+        returns (count, codes) of addresses containing(or starting with) query,
+        codes are sliced by offset/limit.
+        count가 정확해야 하므로 부분 검색은 후보를 끝까지 확인한다(offset + limit에서 멈추지 않음).
+        """
+        if limit is None:
+            limit = len(self._codes)
+        offset = max(0, offset)
+        stop = offset + max(0, limit)
+
+        if prefix:
+            start = bisect_left(self._sorted_addresses, query)
+            end = bisect_left(self._sorted_addresses, query + '\U0010ffff', start)
+            positions = self._sorted_positions[start + offset:min(start + stop, end)]
+            return (end - start, [self._codes[position] for position in positions])
+
+        count, positions = self._ngrams.find_page(query, offset, stop)
+        return (count, [self._codes[position] for position in positions])
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_location_registry():
+    """
+    returns the process-wide LocationRegistry, loading data.json on first use
+    """
+    global _registry
+
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = LocationRegistry.from_file()
+
+    return _registry
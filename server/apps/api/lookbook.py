@@ -0,0 +1,142 @@
+# 무신사 스트릿 스냅(lookbook) 피드 : 성별별 목록을 백그라운드에서 갱신해 캐시에 두고, 요청은 캐시만 읽는다.
+import datetime
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+import logging
+import lxml.html
+import requests
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+LOOKBOOK_URL = 'https://www.musinsa.com/index.php?m=shopstaff&_y=%s&ordw=d_regis&gender=%s'
+GENDERS = ('m', 'f')
+
+
+def lookbook_url(gender, year=None):
+    """
+    returns the lookbook page url of the gender('m' or 'f')
+    """
+    return LOOKBOOK_URL % (year or datetime.datetime.now().year, gender)
+
+
+def parse_lookbook(html):
+    """
+    returns lookbook items of the page, items missing a field are skipped
+    ex) [{'image': '//image.msscdn.net/...', 'brand': '...', 'name': '...'}, ...]
+    """
+    items = []
+    document = lxml.html.fromstring(html)
+    for li in document.xpath('//div[@class="list-box box"]//li[contains(concat(" ", @class, " "), " listItem ")]'):
+        # 이미지 url, 브랜드명, 모델 이름
+        image = li.xpath('.//img/@src')
+        brand = li.xpath('.//p[@class="brackets brand"]')
+        name = li.xpath('.//span')
+        if not (image and brand and name):
+            continue
+        items.append({'image': image[0], 'brand': brand[0].text_content(), 'name': name[0].text_content()})
+
+    return items
+
+
+class LookbookFeed:
+    """
+    Lookbook items per gender on a Django cache backend(CACHES), with TTL and stale-while-revalidate.
+    ttl이 지난 목록은 그대로 반환하면서 백그라운드에서 갱신하고, ttl + stale_ttl이 지나면 캐시에서 사라진다.
+    """
+    KEY_PREFIX = 'lookbook:'
+
+    def __init__(self, alias=None, ttl=None, stale_ttl=None, timeout=None, session=None):
+        self.cache = caches[alias or settings.LOOKBOOK_CACHE_ALIAS]
+        self.ttl = ttl or settings.LOOKBOOK_TTL
+        self.stale_ttl = stale_ttl or settings.LOOKBOOK_STALE_TTL
+        self.timeout = timeout or settings.LOOKBOOK_FETCH_TIMEOUT
+        self.session = session or requests.Session()
+
+        self._workers = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, gender):
+        """
+        returns lookbook items of the gender parsed from the page
+        """
+        response = self.session.get(lookbook_url(gender), timeout=self.timeout)
+        response.raise_for_status()
+
+        return parse_lookbook(response.content)
+
+    def refresh(self, gender):
+        """
+        fetches and caches lookbook items of the gender,
+        keeps the cached items if the page fails or has no items(ex. markup changes)
+        """
+        items = self.fetch(gender)
+        if len(items) == 0:
+            raise ValueError('no lookbook items on the page : ' + gender)
+
+        self.cache.set(self.KEY_PREFIX + gender, {'items': items, 'fetched_at': time.time()},
+                       self.ttl + self.stale_ttl)
+
+        return items
+
+    def _refresh_quietly(self, gender):
+        try:
+            self.refresh(gender)
+        except Exception:
+            logger.exception('failed to refresh lookbook : %s', gender)
+        finally:
+            # DatabaseCache를 쓰면 이 thread의 DB 연결을 닫는다.
+            connections.close_all()
+            with self._lock:
+                self._workers.pop(gender, None)
+
+    def refresh_in_background(self, gender):
+        """
+        refreshes the gender in a background thread, at most one refresh per gender at a time
+        """
+        with self._lock:
+            if gender in self._workers:
+                return
+            worker = threading.Thread(target=self._refresh_quietly, args=(gender,), name='lookbook-refresh', daemon=True)
+            self._workers[gender] = worker
+        worker.start()
+
+    def get(self, gender):
+        """
+        returns cached lookbook items of the gender, None if nothing is cached yet.
+        비어 있거나 ttl이 지났으면 백그라운드 갱신을 시작한다.
+        """
+        entry = self.cache.get(self.KEY_PREFIX + gender)
+        if entry is None or time.time() - entry['fetched_at'] > self.ttl:
+            self.refresh_in_background(gender)
+
+        return entry['items'] if entry is not None else None
+
+    def join(self):
+        """
+        waits until background refreshes finish
+        """
+        with self._lock:
+            workers = list(self._workers.values())
+        for worker in workers:
+            worker.join()
+
+
+_lookbook_feed = None
+_lookbook_feed_lock = threading.Lock()
+
+
+def get_lookbook_feed():
+    """
+    returns the process-wide LookbookFeed
+    """
+    global _lookbook_feed
+
+    if _lookbook_feed is None:
+        with _lookbook_feed_lock:
+            if _lookbook_feed is None:
+                _lookbook_feed = LookbookFeed()
+
+    return _lookbook_feed
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from apps.api.city_index import CITY_INDEX_PATH, CityIndex
+
+
+class Command(BaseCommand):
+    help = 'Builds the global city search index artifact from cities_20000.json'
+
+    def handle(self, *args, **options):
+        index = CityIndex.build()
+        self.stdout.write(self.style.SUCCESS(
+            'Built city index with %d cities : %s' % (len(index), CITY_INDEX_PATH)))
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+import json
+
+from apps.api.storage import get_s3_client, lifecycle_rules
+
+
+class Command(BaseCommand):
+    help = 'Sets the S3 lifecycle rules expiring leftover temp images and unused uploads(replaces existing rules of the bucket)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='only print the rules without applying them')
+
+    def handle(self, *args, **options):
+        rules = lifecycle_rules()
+        self.stdout.write(json.dumps(rules, indent=2))
+
+        if options['dry_run']:
+            return
+
+        get_s3_client().put_bucket_lifecycle_configuration(
+            Bucket=settings.S3_BUCKET_NAME, LifecycleConfiguration={'Rules': rules})
+        self.stdout.write(self.style.SUCCESS(
+            '%d lifecycle rules set on %s' % (len(rules), settings.S3_BUCKET_NAME)))
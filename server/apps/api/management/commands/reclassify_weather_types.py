@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.api.combination_counter import recount
+from apps.api.models import ClothesSetReview
+from apps.api.weather_classifier import weather_classifier
+
+WEATHER_FIELDS = ('max_temp', 'min_temp', 'wind_speed', 'humidity')
+
+
+class Command(BaseCommand):
+    help = 'Reclassifies weather_type of every ClothesSetReview with the current centroids'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000,
+                            help='number of reviews classified and updated at once')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='only count the reviews whose weather_type would change')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        total = 0
+        changed = 0
+
+        rows = ClothesSetReview.objects.order_by('id').values_list('id', 'weather_type', *WEATHER_FIELDS)
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                changed += self.reclassify(batch, options['dry_run'])
+                total += len(batch)
+                batch = []
+        if batch:
+            changed += self.reclassify(batch, options['dry_run'])
+            total += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            '%s %d of %d reviews' % ('Would reclassify' if options['dry_run'] else 'Reclassified', changed, total)))
+
+        # bulk_update는 signal을 보내지 않으므로 today_category 카운터를 다시 계산한다.
+        if changed and not options['dry_run']:
+            recount()
+
+    def reclassify(self, batch, dry_run):
+        """
+        classifies the batch in one call, updates reviews whose weather_type changed
+        """
+        weather_types = weather_classifier.classify([row[2:] for row in batch])
+
+        reviews = [ClothesSetReview(id=row[0], weather_type=int(weather_type))
+                   for row, weather_type in zip(batch, weather_types) if row[1] != weather_type]
+
+        if reviews and not dry_run:
+            with transaction.atomic():
+                ClothesSetReview.objects.bulk_update(reviews, ['weather_type'], batch_size=len(reviews))
+
+        return len(reviews)
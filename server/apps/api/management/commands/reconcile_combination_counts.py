@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.api.combination_counter import recount
+
+
+class Command(BaseCommand):
+    help = 'Recomputes today_category combination counters from the reviews and reports drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='only report the drift without rewriting the counters')
+
+    def handle(self, *args, **options):
+        drift = recount(dry_run=options['dry_run'])
+
+        for (weather_type, combination), (stored, actual) in sorted(drift.items()):
+            self.stdout.write('weather_type %d %r : %d -> %d' % (weather_type, combination, stored, actual))
+
+        self.stdout.write(self.style.SUCCESS(
+            '%d counters drifted%s' % (len(drift), '' if options['dry_run'] else ', recounted')))
@@ -0,0 +1,18 @@
+# Generated by Django 3.0.7 on 2026-10-17 12:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0030_auto_20201203_2311'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='weather',
+            name='location_code',
+            field=models.IntegerField(null=True),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 3.0.7 on 2026-10-17 12:03
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0031_auto_20261017_1201'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeatherFetchTask',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('time', models.IntegerField(choices=[(2, 2), (5, 5), (8, 8), (11, 11), (14, 14), (17, 17), (20, 20), (23, 23)])),
+                ('base_date', models.CharField(max_length=8)),
+                ('x', models.IntegerField()),
+                ('y', models.IntegerField()),
+                ('attempts', models.IntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.CharField(default='', max_length=200)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='weatherfetchtask',
+            constraint=models.UniqueConstraint(fields=('date', 'time', 'x', 'y'), name='unique_weather_fetch_task'),
+        ),
+    ]
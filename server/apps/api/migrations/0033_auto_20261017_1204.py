@@ -0,0 +1,41 @@
+# Generated by Django 3.0.7 on 2026-10-17 12:04
+
+from django.db import migrations, models
+
+
+def delete_duplicate_weathers(apps, schema_editor):
+    """
+    지역 코드별로 저장되던 날씨 중 같은 (date, time, 격자)의 중복 row를 삭제한다.
+    """
+    Weather = apps.get_model('api', 'Weather')
+
+    seen = set()
+    duplicate_ids = []
+    for weather in Weather.objects.order_by('id').values('id', 'date', 'time', 'x', 'y').iterator():
+        key = (weather['date'], weather['time'], weather['x'], weather['y'])
+        if key in seen:
+            duplicate_ids.append(weather['id'])
+        else:
+            seen.add(key)
+
+    for i in range(0, len(duplicate_ids), 1000):
+        Weather.objects.filter(id__in=duplicate_ids[i:i + 1000]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0032_auto_20261017_1203'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_weathers, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='weather',
+            index=models.Index(fields=['x', 'y', 'date', 'time'], name='weather_cell_date_time_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='weather',
+            constraint=models.UniqueConstraint(fields=('date', 'time', 'x', 'y'), name='unique_weather_date_time_cell'),
+        ),
+    ]
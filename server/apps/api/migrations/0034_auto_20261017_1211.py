@@ -0,0 +1,45 @@
+# Generated by Django 3.0.7 on 2026-10-17 12:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0033_auto_20261017_1204'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CombinationCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weather_type', models.IntegerField(choices=[(0, 0), (1, 1), (2, 2), (3, 3), (4, 4), (5, 5), (6, 6), (7, 7), (8, 8), (9, 9), (10, 10)])),
+                ('combination', models.CharField(max_length=200)),
+                ('count', models.IntegerField(default=0)),
+                ('images', models.TextField(default='[]')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CombinationCountMember',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weather_type', models.IntegerField(choices=[(0, 0), (1, 1), (2, 2), (3, 3), (4, 4), (5, 5), (6, 6), (7, 7), (8, 8), (9, 9), (10, 10)])),
+                ('clothes_set_id', models.IntegerField(db_index=True)),
+                ('combination', models.CharField(max_length=200)),
+                ('image_url', models.URLField()),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='combinationcountmember',
+            constraint=models.UniqueConstraint(fields=('weather_type', 'clothes_set_id'), name='unique_combination_count_member'),
+        ),
+        migrations.AddIndex(
+            model_name='combinationcount',
+            index=models.Index(fields=['weather_type', 'count'], name='combination_count_rank_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='combinationcount',
+            constraint=models.UniqueConstraint(fields=('weather_type', 'combination'), name='unique_combination_count'),
+        ),
+    ]
@@ -0,0 +1,16 @@
+# 시리얼라이저가 선언한 관계(select_related / prefetch_related)를 queryset에 적용하는 viewset mixin.
+
+
+class EagerLoadingMixin:
+    """
+    Applies the relation graph declared by the serializer class
+    (setup_eager_loading) to every filtered queryset of the viewset.
+    """
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+
+        serializer_class = self.get_serializer_class()
+        if hasattr(serializer_class, 'setup_eager_loading'):
+            queryset = serializer_class.setup_eager_loading(queryset)
+
+        return queryset
@@ -69,7 +69,8 @@ class ClothesSetReview(models.Model):
     
 
 class Weather(models.Model):
-    location_code = models.IntegerField()
+    # 날씨는 격자(x, y) 단위로 저장, location -> 격자는 조회 시 location_registry로 변환.
+    location_code = models.IntegerField(null=True)
     x = models.IntegerField(default=0)
     y = models.IntegerField(default=0)
     date = models.DateField()
@@ -80,6 +81,64 @@ class Weather(models.Model):
     wind_speed = models.FloatField()
     precipitation = models.FloatField()
 
+    class Meta:
+        indexes = [
+            # 리뷰 작성/수정 시 격자 + 기간으로 조회.
+            models.Index(fields=['x', 'y', 'date', 'time'], name='weather_cell_date_time_idx'),
+        ]
+        constraints = [
+            # 수집 시 중복 확인(date, time, 격자)에도 사용.
+            models.UniqueConstraint(fields=['date', 'time', 'x', 'y'], name='unique_weather_date_time_cell'),
+        ]
+
+
+class WeatherFetchTask(models.Model):
+    # 수집에 실패했거나 아직 수집하지 않은 격자의 날씨 요청, 성공하면 삭제된다.
+    date = models.DateField()
+    time = models.IntegerField(choices=TIME_CHOICES)
+    base_date = models.CharField(max_length=8)
+    x = models.IntegerField()
+    y = models.IntegerField()
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.CharField(max_length=200, default='')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'time', 'x', 'y'], name='unique_weather_fetch_task'),
+        ]
+
+
+class CombinationCount(models.Model):
+    # (weather_type, 하위 카테고리 조합) -> 리뷰 3점을 받은 코디 수, today_category에서 조회.
+    weather_type = models.IntegerField(choices=WEATHER_TYPE_CHOICES)
+    combination = models.CharField(max_length=200)
+    count = models.IntegerField(default=0)
+    # 코디 이미지 url reservoir(JSON list), 최대 COMBINATION_IMAGE_RESERVOIR_SIZE 개
+    images = models.TextField(default='[]')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['weather_type', 'count'], name='combination_count_rank_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['weather_type', 'combination'], name='unique_combination_count'),
+        ]
+
+
+class CombinationCountMember(models.Model):
+    # CombinationCount에 세어진 (weather_type, 코디), 같은 코디를 두 번 세지 않기 위해 사용.
+    # 코디 삭제 후에도 감소시킬 수 있도록 FK 대신 id, 조합, 이미지를 저장한다.
+    weather_type = models.IntegerField(choices=WEATHER_TYPE_CHOICES)
+    clothes_set_id = models.IntegerField(db_index=True)
+    combination = models.CharField(max_length=200)
+    image_url = models.URLField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['weather_type', 'clothes_set_id'], name='unique_combination_count_member'),
+        ]
+
 
 class CategoryData(models.Model):
     upper_category = models.CharField(max_length=9)    
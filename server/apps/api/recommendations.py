@@ -0,0 +1,28 @@
+# 오늘의 추천 코디 조합(today_category) 서비스.
+import json
+from random import sample
+
+from .models import CombinationCount
+
+MAX_ITEM_NUM = 3
+MAX_IMAGE_NUM = 3
+
+
+def get_today_combinations(weather_type, max_item_num=MAX_ITEM_NUM, max_image_num=MAX_IMAGE_NUM):
+    """
+    returns the most frequent category combinations on the weather_type with sample images
+    ex) [{'combination': '반팔-청바지', 'images': [...]}]
+    """
+    # 카운터(combination_counter)에서 코디 수 상위 조합만 읽는다.
+    counters = CombinationCount.objects.filter(
+        weather_type=weather_type, count__gt=0).order_by('-count', 'id')[:max_item_num]
+
+    result_list = []
+    for counter in counters:
+        images_list = json.loads(counter.images)
+        if len(images_list) > max_image_num:
+            images_list = sample(images_list, max_image_num)
+
+        result_list.append({'combination': counter.combination, 'images': images_list})
+
+    return result_list
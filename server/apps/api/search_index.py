@@ -0,0 +1,69 @@
+# 지역/도시 이름 검색에 공통으로 쓰는 n-gram 인덱스.
+from array import array
+
+
+class NgramIndex:
+    """
+    1, 2 글자 n-gram -> position posting list.
+    posting list는 position 순으로 정렬되어 있다.
+    """
+    def __init__(self, strings):
+        self._strings = list(strings)
+
+        grams = {}
+        for position, string in enumerate(self._strings):
+            keys = set(string)
+            keys.update(string[i:i + 2] for i in range(len(string) - 1))
+            for key in keys:
+                grams.setdefault(key, array('l')).append(position)
+        self._grams = grams
+
+    def __len__(self):
+        return len(self._strings)
+
+    def find(self, query):
+        """
+        returns positions of strings containing query, in position order
+        """
+        if len(query) == 0:
+            return range(len(self._strings))
+
+        # 1, 2 글자 검색어는 posting list 자체가 정확한 결과.
+        if len(query) <= 2:
+            return self._grams.get(query, ())
+
+        # 3 글자 이상은 가장 짧은 bigram posting list를 후보로 두고 확인.
+        strings = self._strings
+        return [position for position in self.find_candidates(query) if query in strings[position]]
+
+    def find_candidates(self, query):
+        """
+        returns the shortest bigram posting list of query(3 글자 이상), not verified
+        """
+        candidates = ()
+        for i in range(len(query) - 1):
+            positions = self._grams.get(query[i:i + 2])
+            if positions is None:
+                return ()
+            if i == 0 or len(positions) < len(candidates):
+                candidates = positions
+        return candidates
+
+    def find_page(self, query, offset, stop):
+        """
+        returns (count, positions[offset:stop]) of strings containing query.
+        count가 정확해야 하므로 후보 전체를 확인하지만, 목록은 요청한 page만 만든다.
+        """
+        if len(query) <= 2:
+            positions = self.find(query)
+            return (len(positions), list(positions[offset:stop]))
+
+        count = 0
+        page = []
+        strings = self._strings
+        for position in self.find_candidates(query):
+            if query in strings[position]:
+                if offset <= count < stop:
+                    page.append(position)
+                count += 1
+        return (count, page)
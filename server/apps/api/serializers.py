@@ -1,7 +1,20 @@
-import json
 from rest_framework import serializers
+from .location_registry import get_location_registry
 from .models import User, Clothes, ClothesSet, ClothesSetReview, CategoryData
 
+class EagerLoadingSerializerMixin:
+    # 중첩 시리얼라이저가 읽는 관계, EagerLoadingMixin viewset이 queryset에 적용한다.
+    select_related_fields = ()
+    prefetch_related_fields = ()
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        if cls.select_related_fields:
+            queryset = queryset.select_related(*cls.select_related_fields)
+        if cls.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*cls.prefetch_related_fields)
+        return queryset
+
 class UserSerializer(serializers.ModelSerializer):    
     class Meta:
         model = User
@@ -28,9 +41,11 @@ class ClothesSetSerializer(serializers.ModelSerializer):
         fields = ('id', 'clothes', 'alias', 'style', 'image_url', 'owner')
         read_only_fields = ('owner', )
         
-class ClothesSetReadSerializer(serializers.ModelSerializer):
+class ClothesSetReadSerializer(EagerLoadingSerializerMixin, serializers.ModelSerializer):
     clothes = ClothesSerializer(many=True)
     
+    prefetch_related_fields = ('clothes', )
+    
     class Meta:
         model = ClothesSet
         fields = ('id', 'clothes', 'alias', 'style', 'image_url', 'owner')
@@ -45,14 +60,15 @@ class ClothesSetReviewSerializer(serializers.ModelSerializer):
                   'wind_speed', 'precipitation', 'comment', 'weather_type', 'owner')
         read_only_fields = ('owner', )
 
-class ClothesSetReviewReadSerializer(serializers.ModelSerializer):
+class ClothesSetReviewReadSerializer(EagerLoadingSerializerMixin, serializers.ModelSerializer):
     clothes_set = ClothesSetReadSerializer()
     
+    select_related_fields = ('clothes_set', )
+    prefetch_related_fields = ('clothes_set__clothes', )
+    
     def to_representation(self, instance):
         ret = super().to_representation(instance)
-        with open('apps/api/locations/data.json') as json_file:
-            json_data = json.load(json_file)
-        ret['location'] = json_data[str(ret['location'])]['full_address']
+        ret['location'] = get_location_registry().address(ret['location'])
         
         return ret
     
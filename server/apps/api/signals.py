@@ -0,0 +1,71 @@
+# 리뷰/코디 변경 시 today_category 카운터(combination_counter) 갱신.
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .combination_counter import RECOMMEND_REVIEW, add_clothes_set, refresh_clothes_set, remove_clothes_set
+from .models import ClothesSet, ClothesSetReview
+
+
+def counted_key(review):
+    """
+    returns (clothes_set_id, weather_type) the review is counted under, None if not counted
+    """
+    if review.review == RECOMMEND_REVIEW:
+        return (review.clothes_set_id, review.weather_type)
+    return None
+
+
+@receiver(pre_save, sender=ClothesSetReview)
+def remember_counted_key(sender, instance, raw, **kwargs):
+    # 수정 전 리뷰가 세어진 key를 저장해 두었다가 post_save에서 비교한다.
+    instance._previous_counted_key = None
+    if raw or instance.pk is None:
+        return
+
+    previous = sender.objects.filter(pk=instance.pk).values_list('clothes_set', 'weather_type', 'review').first()
+    if previous is not None and previous[2] == RECOMMEND_REVIEW:
+        instance._previous_counted_key = previous[:2]
+
+
+@receiver(post_save, sender=ClothesSetReview)
+def count_saved_review(sender, instance, raw, **kwargs):
+    if raw:
+        return
+
+    previous = getattr(instance, '_previous_counted_key', None)
+    current = counted_key(instance)
+    if previous == current:
+        return
+
+    if previous is not None:
+        remove_clothes_set(*previous)
+    if current is not None:
+        add_clothes_set(*current)
+
+
+@receiver(post_delete, sender=ClothesSetReview)
+def uncount_deleted_review(sender, instance, **kwargs):
+    key = counted_key(instance)
+    if key is not None:
+        remove_clothes_set(*key)
+
+
+@receiver(m2m_changed, sender=ClothesSet.clothes.through)
+def recount_changed_clothes_set(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    # reverse : clothes.clothesset_set 쪽에서 바뀐 경우, pk_set이 코디 id
+    if not reverse:
+        refresh_clothes_set(instance.pk)
+    elif pk_set:
+        for clothes_set_id in pk_set:
+            refresh_clothes_set(clothes_set_id)
+
+
+@receiver(post_save, sender=ClothesSet)
+def refresh_saved_clothes_set(sender, instance, created, raw, **kwargs):
+    # 코디 이미지(image_url)가 바뀌면 member, reservoir의 url도 바꾼다.
+    if not created and not raw:
+        refresh_clothes_set(instance.pk)
+
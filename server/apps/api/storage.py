@@ -0,0 +1,305 @@
+# S3 업로드용 공유 클라이언트와 이미지 인코딩.
+import atexit
+import boto3
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
+import cv2.cv2 as cv2
+from django.conf import settings
+import logging
+import queue
+import threading
+import time
+import uuid
+
+from .exceptions import S3FileError
+
+logger = logging.getLogger(__name__)
+
+# image format -> (확장자, content type, 인코딩 옵션 setting)
+IMAGE_FORMATS = {
+    'png': ('.png', 'image/png', (cv2.IMWRITE_PNG_COMPRESSION, 'IMAGE_PNG_COMPRESSION')),
+    'webp': ('.webp', 'image/webp', (cv2.IMWRITE_WEBP_QUALITY, 'IMAGE_WEBP_QUALITY')),
+}
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+
+def get_s3_client():
+    """
+    returns the process-wide S3 client,
+    boto3 client는 thread-safe 하므로 connection pool을 요청 간에 공유한다.
+    """
+    global _s3_client
+
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                session = boto3.session.Session(aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                                                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY)
+                _s3_client = session.client('s3', region_name=settings.S3_REGION,
+                                            endpoint_url=settings.S3_ENDPOINT_URL or None, config=Config(
+                    max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                    retries={'max_attempts': 3, 'mode': 'standard'},
+                ))
+
+    return _s3_client
+
+
+def get_object_url(key, bucket_name=None):
+    """
+    returns the public url of the object,
+    S3_ENDPOINT_URL이 있으면 path-style url(<endpoint>/<bucket>/<key>)
+    """
+    bucket_name = bucket_name or settings.S3_BUCKET_NAME
+    if settings.S3_ENDPOINT_URL:
+        return '%s/%s/%s' % (settings.S3_ENDPOINT_URL.rstrip('/'), bucket_name, key)
+
+    return 'https://%s.s3.%s.amazonaws.com/%s' % (bucket_name, settings.S3_REGION, key)
+
+
+# presigned url로 클라이언트가 직접 올리는 원본 이미지 위치 : uploads/<prefix>/<user id>/<uuid>
+UPLOAD_PREFIX = 'uploads'
+
+
+def create_upload_url(user_id, prefix):
+    """
+    returns presigned POST of a new upload key of the user
+    ex) {'key': 'uploads/clothes/1/3f2a...', 'url': 'https://...', 'fields': {...}}
+    """
+    key = '%s/%s/%s/%s' % (UPLOAD_PREFIX, prefix, user_id, uuid.uuid4().hex)
+    post = get_s3_client().generate_presigned_post(
+        Bucket=settings.S3_BUCKET_NAME,
+        Key=key,
+        Conditions=[
+            ['content-length-range', 1, settings.IMAGE_UPLOAD_MAX_BYTES],
+            ['starts-with', '$Content-Type', 'image/'],
+        ],
+        ExpiresIn=settings.IMAGE_UPLOAD_URL_EXPIRES,
+    )
+
+    return {'key': key, 'url': post['url'], 'fields': post['fields']}
+
+
+def is_upload_key(key, user_id, prefix):
+    """
+    whether the key was issued by create_upload_url to the user
+    """
+    parts = key.split('/')
+    return len(parts) == 4 and parts[:3] == [UPLOAD_PREFIX, prefix, str(user_id)] and parts[3].isalnum()
+
+
+def read_upload(key):
+    """
+    returns bytes of the uploaded object, raises S3FileError if it does not exist
+    """
+    try:
+        return get_s3_client().get_object(Bucket=settings.S3_BUCKET_NAME, Key=key)['Body'].read()
+    except Exception:
+        raise S3FileError
+
+
+def encode_image(image, image_format=None):
+    """
+    encodes image in memory, returns (bytes, extension, content type)
+    image_format : 'png' or 'webp', 기본값은 IMAGE_UPLOAD_FORMAT
+    """
+    extension, content_type, (flag, setting_name) = IMAGE_FORMATS[image_format or settings.IMAGE_UPLOAD_FORMAT]
+
+    ok, buffer = cv2.imencode(extension, image, [flag, getattr(settings, setting_name)])
+    if not ok:
+        raise ValueError('failed to encode image as %s' % extension)
+
+    return (buffer.tobytes(), extension, content_type)
+
+
+# 분석 후 temp에 올리는 이미지 prefix, lifecycle 규칙으로 남은 temp 이미지를 만료시킨다.
+TEMP_IMAGE_PREFIXES = ('clothes',)
+
+
+def lifecycle_rules():
+    """
+    returns S3 lifecycle rules expiring temp images that were never promoted or deleted
+    (ex. pending deletes lost on a worker restart) and presigned uploads that were never used
+    """
+    rules = [{
+        'ID': 'expire-%s-temp' % prefix,
+        'Filter': {'Prefix': prefix + '/temp/'},
+        'Status': 'Enabled',
+        'Expiration': {'Days': settings.IMAGE_TEMP_EXPIRE_DAYS},
+    } for prefix in TEMP_IMAGE_PREFIXES]
+    rules.append({
+        'ID': 'expire-%s' % UPLOAD_PREFIX,
+        'Filter': {'Prefix': UPLOAD_PREFIX + '/'},
+        'Status': 'Enabled',
+        'Expiration': {'Days': settings.IMAGE_UPLOAD_EXPIRE_DAYS},
+    })
+
+    return rules
+
+
+def parse_image_url(image_url, prefix):
+    """
+    returns (bucket name, temp key, saved key) of the temp image url
+    ex) https://otte-bucket.s3.ap-northeast-2.amazonaws.com/clothes/temp/clothes_1.png
+    """
+    parts = image_url.split('/')
+    endpoint_url = settings.S3_ENDPOINT_URL.rstrip('/')
+    if endpoint_url and image_url.startswith(endpoint_url + '/'):
+        bucket_name = image_url[len(endpoint_url) + 1:].split('/')[0]
+    else:
+        bucket_name = parts[2].split('.')[0]
+    image_name = parts[-1]
+
+    return (bucket_name, prefix + '/temp/' + image_name, prefix + '/saved/' + image_name)
+
+
+class TempImageDeleter:
+    """
+    Deletes temp objects in batches(delete_objects, 최대 1000개) on a background thread.
+    """
+    def __init__(self, client=None, max_batch=None, max_wait=None):
+        self.client = client
+        self.max_batch = max_batch or settings.IMAGE_TEMP_DELETE_BATCH
+        self.max_wait = max_wait if max_wait is not None else settings.IMAGE_TEMP_DELETE_WAIT
+
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def delete(self, bucket_name, key):
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    worker = threading.Thread(target=self._collect, name='temp-image-deleter', daemon=True)
+                    worker.start()
+                    self._worker = worker
+
+        self._queue.put((bucket_name, key))
+
+    def join(self):
+        """
+        blocks until every queued object is deleted
+        """
+        self._queue.join()
+
+    def _collect(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                self._delete(batch)
+            except Exception:
+                logger.exception('failed to delete %d temp images', len(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _delete(self, batch):
+        client = self.client or get_s3_client()
+
+        keys = {}
+        for bucket_name, key in batch:
+            keys.setdefault(bucket_name, []).append({'Key': key})
+
+        for bucket_name, objects in keys.items():
+            client.delete_objects(Bucket=bucket_name, Delete={'Objects': objects, 'Quiet': True})
+
+
+class ImagePromoter:
+    """
+    Moves uploaded temp images to saved.
+    mode 'sync' : copy + delete 후 반환
+         'deferred_delete' : copy 후 반환, temp 삭제는 TempImageDeleter가 모아서 처리
+         'async' : saved url을 바로 반환, copy + 삭제는 background worker가 처리
+    """
+    def __init__(self, client=None, mode=None, deleter=None, workers=None):
+        self.client = client
+        self.mode = mode or settings.IMAGE_PROMOTION_MODE
+        self.deleter = deleter or TempImageDeleter(client)
+        self.workers = workers or settings.IMAGE_PROMOTION_WORKERS
+
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def promote(self, image_url, prefix):
+        """
+        returns the saved url of the temp image url,
+        temp 이미지가 없으면 S3FileError(async 모드는 로그만 남긴다)
+        """
+        bucket_name, temp_key, saved_key = parse_image_url(image_url, prefix)
+
+        if self.mode == 'async':
+            self._get_executor().submit(self._promote_in_background, bucket_name, temp_key, saved_key)
+        else:
+            self._copy(bucket_name, temp_key, saved_key)
+            if self.mode == 'deferred_delete':
+                self.deleter.delete(bucket_name, temp_key)
+            else:
+                (self.client or get_s3_client()).delete_object(Bucket=bucket_name, Key=temp_key)
+
+        return get_object_url(saved_key, bucket_name)
+
+    def _copy(self, bucket_name, temp_key, saved_key):
+        try:
+            (self.client or get_s3_client()).copy_object(
+                Bucket=bucket_name, CopySource={'Bucket': bucket_name, 'Key': temp_key},
+                Key=saved_key, ACL='public-read')
+        except Exception:
+            raise S3FileError
+
+    def _promote_in_background(self, bucket_name, temp_key, saved_key):
+        try:
+            self._copy(bucket_name, temp_key, saved_key)
+        except S3FileError:
+            logger.error('failed to promote %s/%s', bucket_name, temp_key)
+            return
+        self.deleter.delete(bucket_name, temp_key)
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                        thread_name_prefix='image-promoter')
+        return self._executor
+
+    def join(self):
+        """
+        blocks until every background promotion and deletion is done
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        self.deleter.join()
+
+
+_image_promoter = None
+_image_promoter_lock = threading.Lock()
+
+
+def get_image_promoter():
+    """
+    returns the process-wide ImagePromoter
+    """
+    global _image_promoter
+
+    if _image_promoter is None:
+        with _image_promoter_lock:
+            if _image_promoter is None:
+                _image_promoter = ImagePromoter()
+                # 종료 시 남은 copy, temp 삭제를 마친다(강제 종료 시에는 lifecycle 규칙이 temp를 정리).
+                atexit.register(_image_promoter.join)
+
+    return _image_promoter
@@ -0,0 +1,51 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.api.models import ClothesSetReview, User
+
+class ConstantQueriesMixin:
+    # 페이지 크기와 관계없이 목록 API의 쿼리 수가 같은지 확인하는 TestCase mixin.
+    page_sizes = (1, 10, 100)
+
+    def assertConstantQueries(self, url, data=None, page_sizes=None):
+        """
+        requests url with every page size(limit), asserts the same number of queries
+        returns the number of queries
+        """
+        num_queries = {}
+        for page_size in page_sizes or self.page_sizes:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url, dict(data or {}, limit=page_size))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data['results']), min(page_size, response.data['count']))
+            num_queries[page_size] = len(context.captured_queries)
+
+        self.assertEqual(len(set(num_queries.values())), 1,
+                         'query count changes with page size %s : %r' % (url, num_queries))
+
+        return num_queries.popitem()[1]
+
+
+def make_user(user_id='test-user', **fields):
+    return User.objects.create(user_id=user_id, password='test-password', user_name=user_id, gender='M', **fields)
+
+
+def build_review(clothes_set, owner, review=3, weather_type=4, **fields):
+    """
+    returns unsaved ClothesSetReview of clothes_set, for bulk_create
+    날씨 필드 기본값 : 최고 20도, 최저 10도, 습도 52.5, 풍속 2.5
+    """
+    now = timezone.now()
+    values = dict(start_datetime=now, end_datetime=now, location=1,
+                  max_temp=20, min_temp=10, max_sensible_temp=20, min_sensible_temp=10,
+                  humidity=52.5, wind_speed=2.5, precipitation=0)
+    values.update(fields)
+
+    return ClothesSetReview(clothes_set=clothes_set, owner=owner, review=review, weather_type=weather_type, **values)
+
+
+def make_review(clothes_set, owner, review=3, weather_type=4, **fields):
+    clothes_set_review = build_review(clothes_set, owner, review, weather_type, **fields)
+    clothes_set_review.save()
+    return clothes_set_review
@@ -0,0 +1,57 @@
+import json
+import os
+import pickle
+import tempfile
+from unittest import mock
+from django.test import SimpleTestCase
+
+from apps.api.city_index import CITY_INDEX_VERSION, CityIndex, _source_digest
+
+NAMES = ['Comparison', 'Parisot', 'París', 'Saint-Paris', 'Paris', 'Lyon']
+
+
+class CityIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = CityIndex(range(len(NAMES)), NAMES)
+
+    def search(self, query, offset=0, limit=None):
+        count, positions = self.index.search(query, offset, limit)
+        return (count, [self.index.city(position)[1] for position in positions])
+
+    def test_ranking(self):
+        """
+        정확히 일치 > 대소문자/악센트 무시 일치 > 접두 일치 > 부분 일치 순서 테스트.
+        """
+        self.assertEqual(self.search('Paris'), (5, ['Paris', 'París', 'Parisot', 'Comparison', 'Saint-Paris']))
+        self.assertEqual(self.search('París'), (5, ['París', 'Paris', 'Parisot', 'Comparison', 'Saint-Paris']))
+        self.assertEqual(self.search('PARIS', 1, 2), (5, ['Paris', 'Parisot']))
+        self.assertEqual(self.search('lyo'), (1, ['Lyon']))
+        self.assertEqual(self.index.find_ids('paris'), [2, 4])
+
+    def test_stale_index(self):
+        """
+        오래되거나 깨진 artifact 대신 json에서 다시 만드는지 테스트.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            source_path = os.path.join(directory, 'cities.json')
+            index_path = os.path.join(directory, 'cities.idx')
+            with open(source_path, 'wt', encoding='UTF-8') as json_file:
+                json.dump([{'city_id': i, 'city_name': name} for i, name in enumerate(NAMES)], json_file)
+
+            stale = [
+                # 삭제된 클래스(AttributeError), 다른 구조(TypeError), 잘린 파일(EOFError)
+                b'\x80\x03capps.api.city_index\nRemovedCityIndex\nq\x00)\x81q\x01.',
+                pickle.dumps(None),
+                pickle.dumps((CITY_INDEX_VERSION, _source_digest(source_path), self.index))[:20],
+            ]
+            for data in stale:
+                with open(index_path, 'wb') as index_file:
+                    index_file.write(data)
+                with self.assertLogs('apps.api.city_index', 'WARNING'):
+                    index = CityIndex.load(index_path, source_path)
+                self.assertEqual(index.find_ids('Lyon'), [5])
+
+            CityIndex.build(index_path, source_path)
+            with mock.patch.object(CityIndex, 'from_json') as from_json:
+                self.assertEqual(CityIndex.load(index_path, source_path).find_ids('Lyon'), [5])
+            from_json.assert_not_called()
@@ -0,0 +1,51 @@
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.api.models import ClothesSet, ClothesSetReview
+from apps.api.tests.helpers import build_review, make_user
+from apps.api.views import ClothesSetView
+
+class ClothesSetReviewFilterTests(APITestCase):
+    def setUp(self):
+        self.user = make_user()
+
+        # 코디 i에 weather_type 1 리뷰 i개, 코디 3에는 weather_type 2 리뷰 1개
+        self.clothes_sets = [
+            ClothesSet.objects.create(image_url='https://test/sets/%d.png' % i, owner=self.user)
+            for i in range(4)
+        ]
+        reviews = [(self.clothes_sets[i], 1) for i in range(3) for _ in range(i)] + [(self.clothes_sets[3], 2)]
+        ClothesSetReview.objects.bulk_create([
+            build_review(clothes_set, self.user, weather_type=weather_type)
+            for clothes_set, weather_type in reviews
+        ])
+
+    def filter_ids(self, query_params):
+        with self.assertNumQueries(1):
+            clothes_sets = list(ClothesSetView.filter_reviewed(ClothesSet.objects.order_by('id'), query_params))
+        return [self.clothes_sets.index(clothes_set) for clothes_set in clothes_sets]
+
+    def test_filter_reviewed(self):
+        """
+        리뷰 필터 테스트.
+        """
+        self.assertEqual(self.filter_ids({}), [0, 1, 2, 3])
+        self.assertEqual(self.filter_ids({'review': 'true'}), [1, 2, 3])
+        self.assertEqual(self.filter_ids({'weather_type': '2'}), [3])
+        self.assertEqual(self.filter_ids({'min_reviews': '2'}), [2])
+        self.assertEqual(self.filter_ids({'min_reviews': '1', 'weather_type': '1'}), [1, 2])
+
+    def test_list_invalid(self):
+        """
+        잘못된 min_reviews 테스트.
+        """
+        response = self.client.get('/clothes-sets/', {'min_reviews': 'many'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list(self):
+        """
+        목록 조회 테스트.
+        """
+        response = self.client.get('/clothes-sets/', {'review': 'true', 'weather_type': '1'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
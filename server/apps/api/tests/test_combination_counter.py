@@ -0,0 +1,129 @@
+import json
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from apps.api.combination_counter import recount
+from apps.api.models import CategoryData, Clothes, ClothesSet, CombinationCount
+from apps.api.tests.helpers import make_review, make_user
+
+class CombinationCounterTests(APITestCase):
+    def setUp(self):
+        self.user = make_user()
+
+        self.top = CategoryData.objects.create(upper_category='상의', lower_category='반팔')
+        self.bottom = CategoryData.objects.create(upper_category='하의', lower_category='청바지')
+        self.clothes = [
+            Clothes.objects.create(image_url='https://test/clothes/%d.png' % i, owner=self.user, category=category)
+            for i, category in enumerate([self.top, self.bottom])
+        ]
+
+        self.clothes_set = ClothesSet.objects.create(image_url='https://test/sets/0.png', owner=self.user)
+        self.clothes_set.clothes.set(self.clothes)
+
+    def create_review(self, review=3, weather_type=4, clothes_set=None):
+        return make_review(clothes_set or self.clothes_set, self.user, review=review, weather_type=weather_type)
+
+    def get_counts(self):
+        return {
+            (counter.weather_type, counter.combination): (counter.count, json.loads(counter.images))
+            for counter in CombinationCount.objects.filter(count__gt=0)
+        }
+
+    def test_create_delete(self):
+        """
+        리뷰 생성/삭제 시 코디 한 개당 한 번 세어지는지 테스트.
+        """
+        first = self.create_review()
+        second = self.create_review()
+        self.create_review(review=1)
+        self.assertEqual(self.get_counts(), {(4, '반팔-청바지'): (1, ['https://test/sets/0.png'])})
+
+        first.delete()
+        self.assertEqual(self.get_counts(), {(4, '반팔-청바지'): (1, ['https://test/sets/0.png'])})
+
+        second.delete()
+        self.assertEqual(self.get_counts(), {})
+
+    def test_update(self):
+        """
+        리뷰 수정 시 이전 key에서 빠지고 새 key로 세어지는지 테스트.
+        """
+        review = self.create_review()
+
+        review.weather_type = 6
+        review.save()
+        self.assertEqual(self.get_counts(), {(6, '반팔-청바지'): (1, ['https://test/sets/0.png'])})
+
+        review.review = 2
+        review.save()
+        self.assertEqual(self.get_counts(), {})
+
+    def test_clothes_set_changed(self):
+        """
+        코디의 옷이 바뀌거나 코디가 삭제될 때 테스트.
+        """
+        self.create_review()
+        self.create_review()
+
+        self.clothes_set.clothes.remove(self.clothes[1])
+        self.assertEqual(self.get_counts(), {(4, '반팔'): (1, ['https://test/sets/0.png'])})
+
+        self.clothes_set.delete()
+        self.assertEqual(self.get_counts(), {})
+
+    def test_clothes_set_image_changed(self):
+        """
+        코디 이미지가 바뀌면 reservoir의 url도 바뀌는지 테스트.
+        """
+        self.create_review()
+
+        self.clothes_set.image_url = 'https://test/sets/new.png'
+        self.clothes_set.save()
+        self.assertEqual(self.get_counts(), {(4, '반팔-청바지'): (1, ['https://test/sets/new.png'])})
+        self.assertEqual(recount(dry_run=True), {})
+
+    def test_clothes_deleted(self):
+        """
+        옷 삭제 시 해당 옷이 포함된 코디가 집계에서 빠지는지 테스트.
+        """
+        self.create_review()
+
+        self.clothes[1].delete()
+        self.assertEqual(self.get_counts(), {})
+        self.assertEqual(recount(dry_run=True), {})
+
+    @override_settings(COMBINATION_IMAGE_RESERVOIR_SIZE=1)
+    def test_reservoir_refill(self):
+        """
+        reservoir에 있는 코디 삭제 시 남은 코디 이미지로 다시 채워지는지 테스트.
+        """
+        clothes_sets = [self.clothes_set]
+        for i in range(1, 3):
+            clothes_set = ClothesSet.objects.create(image_url='https://test/sets/%d.png' % i, owner=self.user)
+            clothes_set.clothes.set(self.clothes)
+            clothes_sets.append(clothes_set)
+        for clothes_set in clothes_sets:
+            self.create_review(clothes_set=clothes_set)
+
+        remaining = {clothes_set.image_url for clothes_set in clothes_sets}
+        while remaining:
+            (count, images), = self.get_counts().values()
+            self.assertEqual((count, len(images)), (len(remaining), 1))
+            self.assertIn(images[0], remaining)
+
+            ClothesSet.objects.get(image_url=images[0]).delete()
+            remaining.remove(images[0])
+
+        self.assertEqual(self.get_counts(), {})
+
+    def test_recount(self):
+        """
+        recount가 drift를 보고하고 카운터를 다시 계산하는지 테스트.
+        """
+        self.create_review()
+        CombinationCount.objects.update(count=5)
+
+        self.assertEqual(recount(dry_run=True), {(4, '반팔-청바지'): (5, 1)})
+        self.assertEqual(recount(), {(4, '반팔-청바지'): (5, 1)})
+        self.assertEqual(recount(dry_run=True), {})
+        self.assertEqual(self.get_counts(), {(4, '반팔-청바지'): (1, ['https://test/sets/0.png'])})
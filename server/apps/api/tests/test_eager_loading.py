@@ -0,0 +1,41 @@
+from rest_framework.test import APITestCase
+
+from apps.api.models import CategoryData, Clothes, ClothesSet, ClothesSetReview
+from apps.api.tests.helpers import ConstantQueriesMixin, build_review, make_user
+from apps.api.utils import get_weather_class
+
+class EagerLoadingTests(ConstantQueriesMixin, APITestCase):
+    def setUp(self):
+        self.user = make_user()
+
+        category = CategoryData.objects.create(upper_category='상의', lower_category='반팔')
+        clothes = [
+            Clothes.objects.create(image_url='https://test/clothes/%d.png' % i, owner=self.user, category=category)
+            for i in range(3)
+        ]
+
+        self.weather = {'maxTemp': 20, 'minTemp': 10, 'windSpeed': 2.5, 'humidity': 52.5}
+        weather_type = get_weather_class([20, 10, 2.5, 52.5])
+
+        # 코디 100개, 코디마다 옷 3개와 리뷰 1개
+        for i in range(100):
+            clothes_set = ClothesSet.objects.create(image_url='https://test/sets/%d.png' % i, owner=self.user)
+            clothes_set.clothes.set(clothes)
+        ClothesSetReview.objects.bulk_create([
+            build_review(clothes_set, self.user, weather_type=weather_type)
+            for clothes_set in ClothesSet.objects.all()
+        ])
+
+    def test_clothes_sets(self):
+        """
+        코디 목록 쿼리 수 테스트.
+        """
+        self.assertEqual(self.assertConstantQueries('/clothes-sets/'), 3)
+        self.assertEqual(self.assertConstantQueries('/users/%d/clothes-sets/' % self.user.id), 3)
+
+    def test_clothes_set_reviews(self):
+        """
+        코디 리뷰 목록 쿼리 수 테스트.
+        """
+        self.assertEqual(self.assertConstantQueries('/clothes-set-reviews/', self.weather), 3)
+        self.assertEqual(self.assertConstantQueries('/users/%d/clothes-set-reviews/' % self.user.id), 3)
@@ -0,0 +1,100 @@
+import cv2.cv2 as cv2
+import numpy as np
+import threading
+from unittest import mock
+from django.test import SimpleTestCase
+
+from apps.api.image_pipeline import analyze_clothes_image
+from apps.api.inference import StubInferenceClient, set_inference_client
+from apps.api.utils import execute_inference, remove_background
+
+def float_mask(image):
+    # 이전(float) 구현의 mask, PNG 저장 시처럼 반올림
+    edges = cv2.erode(cv2.dilate(cv2.Canny(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), 10, 30), None), None)
+    contours, _ = cv2.findContours(edges, cv2.RETR_LIST, cv2.CHAIN_APPROX_NONE)
+    mask = np.zeros(edges.shape)
+    cv2.fillConvexPoly(mask, max(contours, key=cv2.contourArea), 255)
+    mask = cv2.erode(cv2.dilate(mask, None, iterations=10), None, iterations=10)
+    return np.rint(cv2.GaussianBlur(mask, (21, 21), 0))
+
+class RemoveBackgroundTests(SimpleTestCase):
+    def test_remove_background(self):
+        """
+        BGRA uint8 결과 테스트.
+        """
+        image = cv2.imread('temp/sample_image.png')
+        result = remove_background(image)
+
+        self.assertEqual(result.dtype, np.uint8)
+        self.assertEqual(result.shape, image.shape[:2] + (4, ))
+        np.testing.assert_array_equal(result[:, :, :3], image)
+        self.assertGreater(result[:, :, 3].max(), 0)
+
+    def test_float_mask(self):
+        """
+        이전 float 구현의 mask와 최대 2 이내로 같은지 테스트.
+        """
+        sample = cv2.imread('temp/sample_image.png')
+        for width in (225, 300, 400, 800, 1200):
+            image = cv2.resize(sample, (width, width), interpolation=cv2.INTER_CUBIC)
+            alpha = remove_background(image)[:, :, 3]
+            self.assertLessEqual(np.abs(alpha - float_mask(image)).max(), 2)
+
+    def test_no_contour(self):
+        """
+        contour가 없는 이미지는 배경을 지우지 않는지 테스트.
+        """
+        image = np.full((50, 50, 3), 128, dtype=np.uint8)
+
+        self.assertTrue((remove_background(image)[:, :, 3] == 255).all())
+
+class AnalyzeClothesImageTests(SimpleTestCase):
+    def tearDown(self):
+        set_inference_client(None)
+
+    def test_concurrent_stages(self):
+        """
+        분류와 배경 제거 + 업로드가 동시에 실행되는지 테스트.
+        """
+        set_inference_client(StubInferenceClient(category_index=14))
+        # 두 단계가 모두 barrier에 도착해야 진행된다, 순서대로 실행되면 timeout으로 실패.
+        barrier = threading.Barrier(2, timeout=5)
+
+        def inference(tensor):
+            barrier.wait()
+            return execute_inference(tensor)
+
+        def upload(image, prefix):
+            barrier.wait()
+            return 'https://test/%s/temp/0.png' % prefix
+
+        image = cv2.imread('temp/sample_image.png')
+        with mock.patch('apps.api.image_pipeline.execute_inference', side_effect=inference), \
+                mock.patch('apps.api.image_pipeline.save_image_s3', side_effect=upload):
+            result = analyze_clothes_image(image)
+
+        self.assertEqual(result, ('하의', '청바지', 'https://test/clothes/temp/0.png'))
+
+    def test_classify_failed(self):
+        """
+        분류가 실패하면 업로드된 temp 이미지를 삭제 queue에 넣고 에러를 다시 던지는지 테스트.
+        """
+        uploaded = threading.Event()
+
+        def inference(tensor):
+            uploaded.wait(5)
+            raise ValueError('endpoint error')
+
+        def upload(image, prefix):
+            uploaded.set()
+            return 'https://otte-bucket.s3.ap-northeast-2.amazonaws.com/%s/temp/0.png' % prefix
+
+        deleter = mock.Mock()
+        image = cv2.imread('temp/sample_image.png')
+        with mock.patch('apps.api.image_pipeline.execute_inference', side_effect=inference), \
+                mock.patch('apps.api.image_pipeline.save_image_s3', side_effect=upload), \
+                mock.patch('apps.api.image_pipeline.get_image_promoter', return_value=mock.Mock(deleter=deleter)):
+            with self.assertRaises(ValueError):
+                analyze_clothes_image(image)
+
+        deleter.delete.assert_called_once_with('otte-bucket', 'clothes/temp/0.png')
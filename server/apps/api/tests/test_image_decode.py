@@ -0,0 +1,77 @@
+import base64
+import cv2.cv2 as cv2
+from unittest import mock
+from django.test import SimpleTestCase, override_settings
+import numpy as np
+
+from apps.api.exceptions import ImageDecodeError
+from apps.api.image_decode import image_size
+from apps.api.utils import byte_to_image, bytes_to_image
+
+
+def encode(extension, width, height, params=()):
+    # 축소 디코딩 결과를 비교할 수 있도록 부드러운 gradient 이미지 사용
+    x = np.linspace(0, 255, width, dtype=np.uint8)
+    image = np.dstack([np.tile(x, (height, 1))] * 3)
+    return cv2.imencode(extension, image, list(params))[1].tobytes()
+
+
+class ImageDecodeTests(SimpleTestCase):
+    def test_image_size(self):
+        """
+        헤더에서 이미지 크기 읽기 테스트.
+        """
+        self.assertEqual(image_size(encode('.jpg', 1600, 1200)), ('jpeg', 1600, 1200))
+        self.assertEqual(image_size(encode('.png', 640, 480)), ('png', 640, 480))
+        self.assertEqual(image_size(encode('.webp', 640, 480)), ('webp', 640, 480))
+        self.assertEqual(image_size(encode('.webp', 641, 479, (cv2.IMWRITE_WEBP_QUALITY, 90))), ('webp', 641, 479))
+        self.assertIsNone(image_size(encode('.bmp', 640, 480)))
+        self.assertIsNone(image_size(b'not an image'))
+
+    def test_reduced_decode(self):
+        """
+        큰 JPEG 축소 디코딩 후 가로 400px 테스트.
+        """
+        data = encode('.jpg', 3200, 2400)
+        image = bytes_to_image(data)
+        self.assertEqual(image.shape, (300, 400, 3))
+
+        full = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        full = cv2.resize(full, (400, 300), interpolation=cv2.INTER_AREA)
+        self.assertLess(np.abs(image.astype(np.int16) - full).mean(), 2)
+
+        self.assertEqual(bytes_to_image(encode('.png', 300, 200)).shape, (200, 300, 3))
+
+    @override_settings(IMAGE_DECODE_MAX_BYTES=20000, IMAGE_DECODE_MAX_PIXELS=100 * 100)
+    def test_limits(self):
+        """
+        입력 bytes, 픽셀 수 제한 테스트.
+        """
+        with self.assertRaises(ImageDecodeError):
+            byte_to_image(base64.b64encode(b'\0' * 40000))
+        with self.assertRaises(ImageDecodeError):
+            bytes_to_image(encode('.png', 200, 200))
+        with self.assertRaises(ImageDecodeError):
+            byte_to_image('not base64!')
+        with self.assertRaises(ImageDecodeError):
+            bytes_to_image(b'not an image')
+
+        self.assertEqual(bytes_to_image(encode('.png', 100, 100)).shape, (100, 100, 3))
+
+    @override_settings(IMAGE_DECODE_MAX_PIXELS=100 * 100)
+    def test_other_formats(self):
+        """
+        WebP 픽셀 수 제한, 지원하지 않는 형식은 디코딩 전에 거부하는지 테스트.
+        """
+        with self.assertRaises(ImageDecodeError):
+            bytes_to_image(encode('.webp', 200, 200))
+        with self.assertRaises(ImageDecodeError):
+            bytes_to_image(encode('.webp', 200, 200, (cv2.IMWRITE_WEBP_QUALITY, 90)))
+        with mock.patch('apps.api.image_decode.cv2.imdecode') as imdecode:
+            with self.assertRaises(ImageDecodeError):
+                bytes_to_image(encode('.bmp', 200, 200))
+            with self.assertRaises(ImageDecodeError):
+                bytes_to_image(encode('.bmp', 50, 50))
+        imdecode.assert_not_called()
+
+        self.assertEqual(bytes_to_image(encode('.webp', 100, 100)).shape, (100, 100, 3))
@@ -0,0 +1,91 @@
+import cv2.cv2 as cv2
+import io
+import json
+import numpy as np
+from botocore.response import StreamingBody
+from botocore.stub import Stubber
+from concurrent.futures import ThreadPoolExecutor
+from django.test import SimpleTestCase, override_settings
+
+from apps.api.inference import (
+    SageMakerInferenceClient,
+    encode_jpeg,
+    encode_npy,
+    StubInferenceClient,
+    get_inference_client,
+    set_inference_client
+)
+from apps.api.utils import execute_inference, get_categories_from_predictions, image_to_tensor
+
+class InferenceClientTests(SimpleTestCase):
+    def tearDown(self):
+        set_inference_client(None)
+
+    def test_sagemaker_client(self):
+        """
+        endpoint 요청/응답 테스트.
+        """
+        client = SageMakerInferenceClient(endpoint_name='test-endpoint')
+        tensor = np.zeros((1, 2, 2, 3))
+        body = json.dumps({'predictions': [[0.1, 0.9]]}).encode()
+
+        with Stubber(client.client) as stubber:
+            stubber.add_response(
+                'invoke_endpoint',
+                {'Body': StreamingBody(io.BytesIO(body), len(body)), 'ContentType': 'application/json'},
+                {'EndpointName': 'test-endpoint', 'Body': json.dumps(tensor.tolist()),
+                 'ContentType': 'application/json', 'Accept': 'application/json'}
+            )
+            self.assertEqual(client.predict(tensor), {'predictions': [[0.1, 0.9]]})
+
+    @override_settings(INFERENCE_CLIENT='stub')
+    def test_process_client(self):
+        """
+        여러 스레드에서 같은 클라이언트를 재사용하는지 테스트.
+        """
+        set_inference_client(None)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            clients = set(executor.map(lambda _: id(get_inference_client()), range(32)))
+
+        self.assertEqual(len(clients), 1)
+        self.assertIsInstance(get_inference_client(), StubInferenceClient)
+
+    def test_stub_client(self):
+        """
+        stub 클라이언트 분류 결과 테스트.
+        """
+        set_inference_client(StubInferenceClient(category_index=14))
+        predictions = execute_inference(np.zeros((1, 224, 224, 3)))
+
+        self.assertEqual(get_categories_from_predictions(predictions), ('하의', '청바지'))
+
+    def test_payload_formats(self):
+        """
+        npy, jpeg payload 테스트.
+        """
+        tensor = image_to_tensor(cv2.imread('temp/sample_image.png'))
+
+        decoded = np.load(io.BytesIO(encode_npy(tensor)))
+        self.assertEqual(decoded.dtype, np.float32)
+        np.testing.assert_allclose(decoded, tensor, atol=1e-6)
+
+        decoded = cv2.imdecode(np.frombuffer(encode_jpeg(tensor), np.uint8), cv2.IMREAD_COLOR)
+        self.assertEqual(decoded.shape, (224, 224, 3))
+
+    def test_sagemaker_client_jpeg(self):
+        """
+        jpeg payload는 이미지마다 요청하는지 테스트.
+        """
+        client = SageMakerInferenceClient(endpoint_name='test-endpoint', payload_format='jpeg')
+        tensor = image_to_tensor(cv2.imread('temp/sample_image.png'))
+        body = json.dumps({'predictions': [[0.1, 0.9]]}).encode()
+
+        with Stubber(client.client) as stubber:
+            for i in range(2):
+                stubber.add_response(
+                    'invoke_endpoint',
+                    {'Body': StreamingBody(io.BytesIO(body), len(body)), 'ContentType': 'application/json'},
+                    {'EndpointName': 'test-endpoint', 'Body': encode_jpeg(tensor),
+                     'ContentType': 'image/jpeg', 'Accept': 'application/json'}
+                )
+            self.assertEqual(client.predict(np.concatenate([tensor, tensor])), {'predictions': [[0.1, 0.9]] * 2})
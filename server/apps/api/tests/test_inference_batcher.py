@@ -0,0 +1,78 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+import json
+import numpy as np
+import threading
+from unittest import mock
+from django.test import SimpleTestCase
+
+from apps.api.inference import SageMakerInferenceClient, StubInferenceClient
+from apps.api.inference_batcher import InferenceBatcher
+
+class FailingClient:
+    def predict(self, tensor):
+        raise ValueError('endpoint error')
+
+class BlockingClient:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def predict(self, tensor):
+        self.release.wait(5)
+        return {'predictions': [[1.0]] * len(tensor)}
+
+class InferenceBatcherTests(SimpleTestCase):
+    def test_batching(self):
+        """
+        동시 요청을 모아서 보내고 결과를 나눠주는지 테스트.
+        """
+        client = StubInferenceClient(category_index=3, latency=0.01)
+        batcher = InferenceBatcher(client, max_batch=8, max_wait=0.05, concurrency=1)
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(lambda n: batcher.predict(np.zeros((n, 4))), [1, 2] * 8))
+
+        self.assertLess(client.calls, 16)
+        for n, result in zip([1, 2] * 8, results):
+            self.assertEqual(len(result['predictions']), n)
+            self.assertEqual(result['predictions'][0][3], 1.0)
+
+    def test_error(self):
+        """
+        endpoint 오류가 요청마다 전달되는지 테스트.
+        """
+        batcher = InferenceBatcher(FailingClient(), max_batch=4, max_wait=0.01, concurrency=1)
+
+        with self.assertRaises(ValueError):
+            batcher.predict(np.zeros((1, 4)))
+
+    def test_jpeg_not_batched(self):
+        """
+        jpeg payload는 모으지 않고 요청 스레드에서 바로 보내는지 테스트.
+        """
+        client = SageMakerInferenceClient(endpoint_name='test-endpoint', payload_format='jpeg')
+        threads = []
+
+        def invoke(body, content_type, accept='application/json'):
+            threads.append(threading.current_thread())
+            return json.dumps({'predictions': [[0.1, 0.9]]}).encode()
+
+        batcher = InferenceBatcher(client, max_batch=8, max_wait=1.0, concurrency=1)
+        with mock.patch.object(client, 'invoke', side_effect=invoke):
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(executor.map(lambda i: batcher.predict(np.zeros((1, 224, 224, 3))), range(4)))
+
+        self.assertEqual(results, [{'predictions': [[0.1, 0.9]]}] * 4)
+        self.assertEqual(len(threads), 4)
+        self.assertNotIn('inference-batcher', [thread.name for thread in threads])
+        self.assertIsNone(batcher._worker)
+
+    def test_timeout(self):
+        """
+        endpoint가 응답하지 않으면 timeout 후 TimeoutError 테스트.
+        """
+        client = BlockingClient()
+        batcher = InferenceBatcher(client, max_batch=4, max_wait=0.01, concurrency=1, timeout=0.1)
+
+        with self.assertRaises(TimeoutError):
+            batcher.predict(np.zeros((1, 4)))
+        client.release.set()
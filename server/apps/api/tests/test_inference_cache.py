@@ -0,0 +1,70 @@
+import numpy as np
+import time
+from django.test import SimpleTestCase, TestCase
+
+from apps.api.inference_cache import DjangoClassificationCache, LocMemClassificationCache, image_cache_key
+
+def result(i):
+    return {'image_url': 'https://test/clothes/temp/%d.png' % i, 'upper_category': '상의',
+            'lower_category': '반팔티셔츠', 'category_id': [{'id': 1}]}
+
+class ClassificationCacheTests(SimpleTestCase):
+    def test_image_cache_key(self):
+        """
+        이미지 내용, 사용자별 key 테스트.
+        """
+        image = np.zeros((4, 4, 3), dtype=np.uint8)
+        other = image.copy()
+        other[0, 0, 0] = 1
+
+        self.assertEqual(image_cache_key(1, image), image_cache_key(1, image.copy()))
+        self.assertNotEqual(image_cache_key(1, image), image_cache_key(1, other))
+        self.assertNotEqual(image_cache_key(1, image), image_cache_key(2, image))
+
+    def test_locmem_lru(self):
+        """
+        최대 크기를 넘으면 가장 오래 쓰지 않은 항목을 지우는지 테스트.
+        """
+        cache = LocMemClassificationCache(max_size=2, ttl=60)
+        cache.set('a', result(0))
+        cache.set('b', result(1))
+        cache.get('a')
+        cache.set('c', result(2))
+
+        self.assertEqual(cache.get('a'), result(0))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), result(2))
+
+    def test_locmem_ttl(self):
+        """
+        만료 테스트.
+        """
+        cache = LocMemClassificationCache(max_size=2, ttl=0.01)
+        cache.set('a', result(0))
+        time.sleep(0.02)
+
+        self.assertIsNone(cache.get('a'))
+
+    def test_discard_url(self):
+        """
+        이미지 url로 항목을 지우는지 테스트.
+        """
+        for cache in [LocMemClassificationCache(max_size=2, ttl=60), DjangoClassificationCache(alias='default', ttl=60)]:
+            cache.set('a', result(0))
+            cache.set('b', result(1))
+            cache.discard_url(result(0)['image_url'])
+
+            self.assertIsNone(cache.get('a'))
+            self.assertEqual(cache.get('b'), result(1))
+
+class SharedClassificationCacheTests(TestCase):
+    def test_shared_discard_url(self):
+        """
+        다른 worker(인스턴스)에서 지운 항목이 보이지 않는지 테스트.
+        """
+        worker, other_worker = DjangoClassificationCache(ttl=60), DjangoClassificationCache(ttl=60)
+        other_worker.set('a', result(0))
+        self.assertEqual(worker.get('a'), result(0))
+
+        worker.discard_url(result(0)['image_url'])
+        self.assertIsNone(other_worker.get('a'))
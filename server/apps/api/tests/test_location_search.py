@@ -0,0 +1,50 @@
+from django.test import SimpleTestCase
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.api.location_registry import get_location_registry
+
+QUERIES = ['', '서울', '서울특별시 종로구', '종로', '구', '강원', '수원시 ', '없는 주소']
+
+
+def brute_force(query, prefix=False):
+    # 인덱스 없이 전체 주소를 훑은 결과, 접두 검색은 주소 순
+    registry = get_location_registry()
+    if prefix:
+        codes = [code for code in registry.codes() if registry.address(code).startswith(query)]
+        return sorted(codes, key=registry.address)
+    return [code for code in registry.codes() if query in registry.address(code)]
+
+
+class LocationSearchTests(SimpleTestCase):
+    def test_search(self):
+        """
+        부분/접두 검색 결과가 전체 탐색과 같은지 테스트.
+        """
+        registry = get_location_registry()
+        for prefix in (False, True):
+            for query in QUERIES:
+                expected = brute_force(query, prefix)
+                self.assertEqual(registry.search(query, prefix=prefix), (len(expected), expected))
+
+                for offset, limit in ((0, 10), (5, 3), (max(0, len(expected) - 1), 10), (len(expected) + 5, 10)):
+                    self.assertEqual(registry.search(query, offset, limit, prefix),
+                                     (len(expected), expected[offset:offset + limit]))
+
+                # 음수 offset은 0으로 처리
+                self.assertEqual(registry.search(query, -1, 3, prefix), (len(expected), expected[:3]))
+
+
+class LocationSearchViewTests(APITestCase):
+    def test_prefix_param(self):
+        """
+        prefix 파라미터 파싱 테스트(prefix=false는 부분 검색).
+        """
+        for param, prefix in (('1', True), ('true', True), ('false', False), ('0', False)):
+            response = self.client.get('/clothes-set-reviews/location_search/',
+                                       {'search': '종로', 'prefix': param, 'limit': 5})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            expected = brute_force('종로', prefix)
+            self.assertEqual(response.data['count'], len(expected))
+            self.assertEqual([int(result['id']) for result in response.data['results']], expected[:5])
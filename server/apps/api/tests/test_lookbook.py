@@ -0,0 +1,85 @@
+from pathlib import Path
+import time
+from unittest import mock
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TransactionTestCase
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+
+from apps.api.lookbook import LookbookFeed, parse_lookbook
+from apps.api.tests.helpers import make_user
+
+FIXTURE = (Path(__file__).parent / 'fixtures' / 'lookbook.html').read_bytes()
+
+
+def make_feed(content=FIXTURE, **kwargs):
+    session = mock.Mock()
+    session.get.return_value.content = content
+    return LookbookFeed(session=session, ttl=60, stale_ttl=600, **kwargs)
+
+
+class LookbookFeedTests(TransactionTestCase):
+    def setUp(self):
+        caches[settings.LOOKBOOK_CACHE_ALIAS].clear()
+
+    def test_parse_lookbook(self):
+        """
+        저장된 페이지에서 lookbook 목록 파싱 테스트.
+        """
+        items = parse_lookbook(FIXTURE)
+        self.assertEqual(len(items), 6)
+        self.assertEqual(items[0], {'image': '//image.msscdn.net/images/staff/1001.jpg', 'brand': '커버낫', 'name': '김민수'})
+
+    def test_cold_cache(self):
+        """
+        캐시가 비어 있으면 None 반환 후 백그라운드 갱신 테스트.
+        """
+        feed = make_feed()
+        self.assertIsNone(feed.get('m'))
+
+        feed.join()
+        self.assertEqual(len(feed.get('m')), 6)
+        feed.session.get.assert_called_once()
+
+    def test_stale_while_revalidate(self):
+        """
+        ttl이 지난 목록을 반환하면서 갱신, 실패 시 기존 목록 유지 테스트.
+        """
+        feed = make_feed()
+        feed.refresh('f')
+
+        with mock.patch('apps.api.lookbook.time.time', return_value=time.time() + 120), \
+                self.assertLogs('apps.api.lookbook', 'ERROR'):
+            feed.session.get.return_value.content = b'<html><body>changed</body></html>'
+            self.assertEqual(len(feed.get('f')), 6)
+            feed.join()
+            self.assertEqual(feed.session.get.call_count, 2)
+            self.assertEqual(len(feed.cache.get(feed.KEY_PREFIX + 'f')['items']), 6)
+
+
+class LookbookViewTests(APITransactionTestCase):
+    def setUp(self):
+        caches[settings.LOOKBOOK_CACHE_ALIAS].clear()
+        self.user = make_user()
+        self.client.force_authenticate(self.user)
+
+        self.feed = make_feed()
+        patcher = mock.patch('apps.api.views.get_lookbook_feed', return_value=self.feed)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_lookbook(self):
+        """
+        캐시된 목록에서 5개 뽑기, 목록이 없으면 503 테스트.
+        """
+        response = self.client.get('/clothes/lookbook/')
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        self.feed.join()
+        response = self.client.get('/clothes/lookbook/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual(len({item['image'] for item in response.data}), 5)
+        self.feed.session.get.assert_called_once_with(mock.ANY, timeout=mock.ANY)
+        self.assertIn('gender=m', self.feed.session.get.call_args[0][0])
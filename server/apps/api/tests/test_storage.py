@@ -0,0 +1,140 @@
+import cv2.cv2 as cv2
+import io
+import numpy as np
+from unittest import mock
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from apps.api.exceptions import S3FileError
+from apps.api.storage import (
+    ImagePromoter,
+    TempImageDeleter,
+    encode_image,
+    get_image_promoter,
+    get_object_url,
+    parse_image_url
+)
+from apps.api.utils import save_image_s3
+
+class StorageTests(SimpleTestCase):
+    def setUp(self):
+        self.image = np.zeros((20, 20, 4), dtype=np.uint8)
+        self.image[5:15, 5:15] = (10, 20, 30, 255)
+
+    def test_encode_image(self):
+        """
+        png, webp 인코딩 테스트.
+        """
+        body, extension, content_type = encode_image(self.image, 'png')
+        self.assertEqual((extension, content_type), ('.png', 'image/png'))
+        decoded = cv2.imdecode(np.frombuffer(body, np.uint8), cv2.IMREAD_UNCHANGED)
+        np.testing.assert_array_equal(decoded, self.image)
+
+        body, extension, content_type = encode_image(self.image, 'webp')
+        self.assertEqual((extension, content_type), ('.webp', 'image/webp'))
+        decoded = cv2.imdecode(np.frombuffer(body, np.uint8), cv2.IMREAD_UNCHANGED)
+        self.assertEqual(decoded.shape, (20, 20, 4))
+
+    def test_save_image_s3(self):
+        """
+        임시 파일 없이 업로드하고, 같은 시각에 올라와도 key가 겹치지 않는지 테스트.
+        """
+        with mock.patch('apps.api.utils.get_s3_client') as get_s3_client:
+            urls = [save_image_s3(self.image, 'clothes') for i in range(2)]
+
+        put_object = get_s3_client.return_value.put_object
+        self.assertEqual(put_object.call_count, 2)
+        keys = [call[1]['Key'] for call in put_object.call_args_list]
+        self.assertNotEqual(keys[0], keys[1])
+        for key, url in zip(keys, urls):
+            self.assertTrue(key.startswith('clothes/temp/clothes_'))
+            self.assertTrue(url.endswith('.amazonaws.com/' + key))
+
+
+class ImagePromoterTests(SimpleTestCase):
+    temp_url = 'https://otte-bucket.s3.ap-northeast-2.amazonaws.com/clothes/temp/clothes_%d.png'
+    saved_url = 'https://otte-bucket.s3.ap-northeast-2.amazonaws.com/clothes/saved/clothes_%d.png'
+
+    def promote(self, mode, num=3):
+        client = mock.Mock()
+        promoter = ImagePromoter(client, mode=mode, deleter=TempImageDeleter(client, max_wait=0.05))
+
+        urls = [promoter.promote(self.temp_url % i, 'clothes') for i in range(num)]
+        self.assertEqual(urls, [self.saved_url % i for i in range(num)])
+
+        promoter.join()
+        self.assertEqual([call[1]['Key'] for call in client.copy_object.call_args_list],
+                         ['clothes/saved/clothes_%d.png' % i for i in range(num)])
+
+        return client
+
+    def test_sync(self):
+        """
+        copy 후 바로 삭제 테스트.
+        """
+        client = self.promote('sync')
+        self.assertEqual(client.delete_object.call_count, 3)
+        self.assertEqual(client.delete_objects.call_count, 0)
+
+    def test_deferred_delete(self):
+        """
+        temp 이미지를 모아서 한 번에 삭제하는지 테스트.
+        """
+        client = self.promote('deferred_delete')
+        self.assertEqual(client.delete_object.call_count, 0)
+        client.delete_objects.assert_called_once_with(Bucket='otte-bucket', Delete={
+            'Objects': [{'Key': 'clothes/temp/clothes_%d.png' % i} for i in range(3)], 'Quiet': True})
+
+    def test_async(self):
+        """
+        background에서 copy + 삭제 테스트.
+        """
+        client = self.promote('async')
+        deleted = [obj['Key'] for call in client.delete_objects.call_args_list for obj in call[1]['Delete']['Objects']]
+        self.assertEqual(sorted(deleted), ['clothes/temp/clothes_%d.png' % i for i in range(3)])
+
+    @override_settings(S3_ENDPOINT_URL='http://localhost:4566/')
+    def test_endpoint_url(self):
+        """
+        S3_ENDPOINT_URL이 있을 때 url 생성, 파싱 테스트.
+        """
+        temp_url = get_object_url('clothes/temp/clothes_0.png')
+        self.assertEqual(temp_url, 'http://localhost:4566/otte-bucket/clothes/temp/clothes_0.png')
+        self.assertEqual(parse_image_url(temp_url, 'clothes'),
+                         ('otte-bucket', 'clothes/temp/clothes_0.png', 'clothes/saved/clothes_0.png'))
+
+        client = mock.Mock()
+        promoter = ImagePromoter(client, mode='sync')
+        self.assertEqual(promoter.promote(temp_url, 'clothes'),
+                         'http://localhost:4566/otte-bucket/clothes/saved/clothes_0.png')
+
+    def test_missing_temp_image(self):
+        """
+        temp 이미지가 없을 때 테스트.
+        """
+        client = mock.Mock()
+        client.copy_object.side_effect = Exception('NoSuchKey')
+        promoter = ImagePromoter(client, mode='deferred_delete')
+
+        with self.assertRaises(S3FileError):
+            promoter.promote(self.temp_url % 0, 'clothes')
+
+    @mock.patch('apps.api.storage._image_promoter', None)
+    @mock.patch('apps.api.storage.atexit.register')
+    def test_join_at_exit(self, register):
+        """
+        종료 시 남은 copy, 삭제를 마치도록 join이 등록되는지 테스트.
+        """
+        promoter = get_image_promoter()
+        register.assert_called_once_with(promoter.join)
+
+    @mock.patch('apps.api.management.commands.configure_s3_lifecycle.get_s3_client')
+    def test_lifecycle_rules(self, get_s3_client):
+        """
+        temp 이미지 만료 lifecycle 규칙 설정 테스트.
+        """
+        call_command('configure_s3_lifecycle', stdout=io.StringIO())
+
+        rules = get_s3_client.return_value.put_bucket_lifecycle_configuration.call_args[1]['LifecycleConfiguration']['Rules']
+        self.assertEqual([rule['Filter']['Prefix'] for rule in rules], ['clothes/temp/', 'uploads/'])
+        self.assertEqual(rules[0]['Expiration'], {'Days': 1})
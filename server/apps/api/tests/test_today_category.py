@@ -0,0 +1,68 @@
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.api.combination_counter import recount
+from apps.api.models import CategoryData, Clothes, ClothesSet, ClothesSetReview
+from apps.api.tests.helpers import build_review, make_user
+from apps.api.utils import get_weather_class
+
+class TodayCategoryTests(APITestCase):
+    def setUp(self):
+        self.user = make_user()
+
+        self.weather = {'maxTemp': 20, 'minTemp': 10, 'windSpeed': 2.5, 'humidity': 52.5}
+        self.weather_type = get_weather_class([20, 10, 2.5, 52.5])
+
+        top = CategoryData.objects.create(upper_category='상의', lower_category='반팔')
+        bottom = CategoryData.objects.create(upper_category='하의', lower_category='청바지')
+        clothes = [
+            Clothes.objects.create(image_url='https://test/clothes/%d.png' % i, owner=self.user, category=category)
+            for i, category in enumerate([top, bottom, top, None])
+        ]
+
+        # 반팔-청바지 코디 2개, 반팔 코디 1개(카테고리 없는 옷 포함)
+        self.clothes_sets = []
+        for i, clothes_set_clothes in enumerate([clothes[:2], clothes[1:3], [clothes[2], clothes[3]]]):
+            clothes_set = ClothesSet.objects.create(image_url='https://test/sets/%d.png' % i, owner=self.user)
+            clothes_set.clothes.set(clothes_set_clothes)
+            self.clothes_sets.append(clothes_set)
+
+    def create_reviews(self, num):
+        ClothesSetReview.objects.bulk_create([
+            build_review(self.clothes_sets[i % len(self.clothes_sets)], self.user, weather_type=self.weather_type)
+            for i in range(num)
+        ])
+        # bulk_create는 signal을 보내지 않으므로 카운터를 다시 계산한다.
+        recount()
+
+    def get_today_category(self, num_queries):
+        with self.assertNumQueries(num_queries):
+            response = self.client.get('/clothes/today_category/', self.weather)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_today_category(self):
+        """
+        조합별 코디 수 테스트.
+        """
+        self.create_reviews(10)
+        data = self.get_today_category(1)
+
+        self.assertEqual([item['combination'] for item in data], ['반팔-청바지', '반팔'])
+        self.assertEqual(set(data[0]['images']), {'https://test/sets/0.png', 'https://test/sets/1.png'})
+        self.assertEqual(data[1]['images'], ['https://test/sets/2.png'])
+
+    def test_today_category_num_queries(self):
+        """
+        리뷰 수와 관계없이 쿼리 수가 일정한지 테스트.
+        """
+        self.create_reviews(10)
+        small = self.get_today_category(1)
+
+        self.create_reviews(10000 - 10)
+        large = self.get_today_category(1)
+
+        self.assertEqual(
+            [(item['combination'], set(item['images'])) for item in small],
+            [(item['combination'], set(item['images'])) for item in large]
+        )
@@ -0,0 +1,68 @@
+import io
+from unittest import mock
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.api.inference import StubInferenceClient, set_inference_client
+from apps.api.tests.helpers import make_user
+
+class DirectUploadTests(APITestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.client.force_authenticate(self.user)
+        set_inference_client(StubInferenceClient())
+
+        with open('temp/sample_image.png', 'rb') as image:
+            self.image = image.read()
+
+        # S3 대신 mock 클라이언트 사용
+        patchers = [
+            mock.patch('apps.api.storage.get_s3_client'),
+            mock.patch('apps.api.utils.get_image_promoter'),
+            mock.patch('apps.api.image_pipeline.save_image_s3', return_value='https://test/clothes/temp/0.png'),
+        ]
+        self.s3, self.promoter, _ = [patcher.start() for patcher in patchers]
+        for patcher in patchers:
+            self.addCleanup(patcher.stop)
+        self.s3.return_value.generate_presigned_post.side_effect = lambda **kwargs: {
+            'url': 'https://test-bucket', 'fields': {'key': kwargs['Key']}}
+        self.s3.return_value.get_object.side_effect = lambda **kwargs: {'Body': io.BytesIO(self.image)}
+
+    def tearDown(self):
+        set_inference_client(None)
+
+    def test_upload_url(self):
+        """
+        presigned url 발급 테스트.
+        """
+        response = self.client.post('/clothes/upload_url/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['key'].startswith('uploads/clothes/%d/' % self.user.id))
+        self.assertEqual(response.data['fields'], {'key': response.data['key']})
+
+    def test_inference_image_key(self):
+        """
+        업로드된 object key로 분석 테스트.
+        """
+        key = self.client.post('/clothes/upload_url/').data['key']
+        response = self.client.post('/clothes/inference/', {'image_key': key}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['image_url'], 'https://test/clothes/temp/0.png')
+        self.s3.return_value.get_object.assert_called_once_with(Bucket=mock.ANY, Key=key)
+        self.promoter.return_value.deleter.delete.assert_called_once_with(mock.ANY, key)
+
+    def test_inference_invalid_key(self):
+        """
+        다른 사용자의 key, 이미지가 아닌 object 테스트.
+        """
+        response = self.client.post('/clothes/inference/', {'image_key': 'uploads/clothes/0/abc'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.image = b'not an image'
+        key = self.client.post('/clothes/upload_url/').data['key']
+        response = self.client.post('/clothes/inference/', {'image_key': key}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post('/clothes/inference/', {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
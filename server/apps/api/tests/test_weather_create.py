@@ -0,0 +1,39 @@
+from unittest import mock
+from urllib.error import URLError
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.api.location_registry import get_location_registry
+from apps.api.models import Weather
+from apps.api.views import ClothesSetReviewView
+
+RESPONSE = {'T3H': 20.0, 'WCI': 19.0, 'REH': 50, 'WSD': 1.5, 'R06': 0.0}
+
+
+class WeatherCreateTests(APITestCase):
+    def test_concurrent_create(self):
+        """
+        날씨를 받는 사이 다른 요청이 같은 격자를 저장해도 오류가 없는지 테스트.
+        """
+        x, y = get_location_registry().grid(1)
+
+        def get_weather_grid(date, new_x, new_y):
+            # 15:00 -> 14시 예보, 먼저 저장된 것처럼 같은 격자에 저장
+            Weather.objects.create(date=date[0:10], time=14, x=new_x, y=new_y, temp=1.0, sensible_temp=1.0,
+                                   humidity=1, wind_speed=1.0, precipitation=0.0)
+            return RESPONSE
+
+        with mock.patch('apps.api.views.get_weather_grid', side_effect=get_weather_grid):
+            response = ClothesSetReviewView.common_weather_create('2020-05-28T15:00', '2020-05-28T15:00', 1)
+
+        self.assertIsNone(response)
+        self.assertEqual(Weather.objects.filter(x=x, y=y).count(), 1)
+
+    def test_fetch_error(self):
+        """
+        날씨 요청 실패 시 500 응답 테스트.
+        """
+        with mock.patch('apps.api.views.get_weather_grid', side_effect=URLError('timeout')):
+            response = ClothesSetReviewView.common_weather_create('2020-05-28T15:00', '2020-05-28T15:00', 1)
+
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,91 @@
+import threading
+from unittest import mock
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+
+from apps.api.models import Weather, WeatherFetchTask
+from apps.api.weather_ingest import claim_due_tasks, drain, process_due_tasks
+
+RESPONSE = {'T3H': 20.0, 'WCI': 19.0, 'REH': 50, 'WSD': 1.5, 'R06': 0.0}
+
+
+class StubFetcher:
+    # 요청한 격자를 기록, 두 drain이 겹치도록 첫 요청에서 잠시 기다린다.
+    calls = []
+    started = threading.Event()
+
+    def fetch_many(self, base_date, base_time, cells):
+        StubFetcher.calls.extend(cells)
+        StubFetcher.started.set()
+        threading.Event().wait(0.1)
+        return ({cell: RESPONSE for cell in cells}, {})
+
+    def close(self):
+        pass
+
+
+class FailingFetcher:
+    def fetch_many(self, base_date, base_time, cells):
+        return ({}, {cell: OSError('timeout') for cell in cells})
+
+
+class WeatherIngestTests(TransactionTestCase):
+    def setUp(self):
+        StubFetcher.calls = []
+        StubFetcher.started = threading.Event()
+        WeatherFetchTask.objects.bulk_create([
+            WeatherFetchTask(date='2020-05-28', time=20, base_date='20200528', x=x, y=127)
+            for x in range(50, 60)
+        ])
+
+    def test_claim_due_tasks(self):
+        """
+        가져간 task는 lease 동안 다른 drain에서 제외되는지 테스트.
+        """
+        now = timezone.now()
+        self.assertEqual(len(claim_due_tasks(now)), 10)
+        self.assertEqual(len(claim_due_tasks(now)), 0)
+        self.assertFalse(WeatherFetchTask.objects.filter(next_attempt_at__lte=now).exists())
+
+    def test_claim_without_skip_locked(self):
+        """
+        SKIP LOCKED을 지원하지 않는 DB에서도 task를 가져오는지 테스트.
+        """
+        with mock.patch.object(connection.features, 'has_select_for_update_skip_locked', False):
+            self.assertEqual(len(claim_due_tasks(timezone.now())), 10)
+
+    @override_settings(WEATHER_RETRY_MAX_ATTEMPTS=1)
+    def test_dead_letter_logged(self):
+        """
+        최대 시도 횟수를 넘긴 task가 로그로 남는지 테스트.
+        """
+        with self.assertLogs('apps.api.weather_ingest', 'ERROR') as logs:
+            self.assertEqual(process_due_tasks(FailingFetcher()), 10)
+
+        self.assertEqual(len(logs.output), 10)
+        self.assertIn('(50, 127)', logs.output[0])
+        self.assertFalse(WeatherFetchTask.objects.filter(attempts=0).exists())
+
+    @mock.patch('apps.api.weather_ingest.ForecastFetcher', StubFetcher)
+    def test_concurrent_drains(self):
+        """
+        동시에 실행된 두 drain이 같은 격자를 한 번만 요청하는지 테스트.
+        """
+        def run_drain():
+            try:
+                drain()
+            finally:
+                connection.close()
+
+        first = threading.Thread(target=run_drain)
+        first.start()
+        self.assertTrue(StubFetcher.started.wait(5))
+        second = threading.Thread(target=run_drain)
+        second.start()
+        first.join(5)
+        second.join(5)
+
+        self.assertEqual(sorted(StubFetcher.calls), [(x, 127) for x in range(50, 60)])
+        self.assertEqual(Weather.objects.count(), 10)
+        self.assertFalse(WeatherFetchTask.objects.exists())
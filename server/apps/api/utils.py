@@ -1,39 +1,78 @@
 import base64
-import boto3
 import cv2.cv2 as cv2
 from django.conf import settings
-import json
-import math
 import numpy as np
-import os
-import sagemaker
-from sagemaker.predictor import RealTimePredictor
 import time
+import uuid
 
 from .choices import LOWER_CATEGORY_CHOICES
-from .exceptions import S3FileError
+from .exceptions import ImageDecodeError, S3FileError
+from .image_decode import decode_image
+from .inference import get_inference_client
+from .inference_batcher import get_inference_batcher
+from .storage import (
+    encode_image,
+    get_image_promoter,
+    get_object_url,
+    get_s3_client,
+    is_upload_key,
+    read_upload
+)
+from .weather_classifier import weather_classifier
 
 def byte_to_image(inp):
     """
     converts base64 string to image
     """
+    # base64 길이로 디코딩 전에 크기 확인
+    if len(inp) * 3 // 4 > settings.IMAGE_DECODE_MAX_BYTES:
+        raise ImageDecodeError('image is larger than %d bytes' % settings.IMAGE_DECODE_MAX_BYTES)
+
+    try:
+        _bytes = base64.b64decode(inp)
+    except ValueError:
+        raise ImageDecodeError('invalid base64 image')
+
+    return bytes_to_image(_bytes)
+
+
+def bytes_to_image(_bytes):
+    """
+    converts encoded image bytes to image at most 400px wide
+    """
     MAX_WIDTH = 400
     
-    _bytes = base64.b64decode(inp)
-    nparr = np.fromstring(_bytes, dtype=np.uint8)
-    img = cv2.imdecode(nparr, 1)
-    
-    if (img.shape[1] > MAX_WIDTH):    
-        ratio = float(MAX_WIDTH) / img.shape[1]
-        dim = (MAX_WIDTH, int(img.shape[0] * ratio))
-        img = cv2.resize(img, dim, interpolation=cv2.INTER_AREA)
-    
-    return img
+    return decode_image(_bytes, MAX_WIDTH)
+
+
+def request_image(data, user_id, prefix):
+    """
+    returns image of the request data, None if it has no image
+    image : base64 string, image_key : presigned url로 올린 object key(upload_url 참고)
+    raises S3FileError if the uploaded image does not exist,
+    ImageDecodeError if the image is too large or not an image
+    """
+    if 'image' in data.keys():
+        return byte_to_image(data['image'])
+
+    if 'image_key' not in data.keys():
+        return None
+
+    key = data['image_key']
+    if not is_upload_key(key, user_id, prefix):
+        raise S3FileError
+
+    # 원본은 읽은 뒤 필요 없으므로 모아서 삭제
+    data = read_upload(key)
+    get_image_promoter().deleter.delete(settings.S3_BUCKET_NAME, key)
+
+    return bytes_to_image(data)
 
 
 def remove_background(image):
     """
-    Removes background from image
+    Removes background from image,
+    returns BGRA uint8 image whose alpha is the smoothed mask of the largest contour
     """
     # Paramters.
     BLUR = 21
@@ -41,7 +80,6 @@ def remove_background(image):
     CANNY_THRESH_2 = 30
     MASK_DILATE_ITER = 10
     MASK_ERODE_ITER = 10
-    MASK_COLOR = (0.0,0.0,1.0)
     
     gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     
@@ -50,40 +88,25 @@ def remove_background(image):
     edges = cv2.dilate(edges, None)
     edges = cv2.erode(edges, None)
     
-    # Find contours in edges, sort by area
-    contour_info = []
+    # Find contours in edges, 가장 큰 contour 하나만 사용(정렬 x)
     contours, _ = cv2.findContours(edges, cv2.RETR_LIST, cv2.CHAIN_APPROX_NONE)
-
-    for c in contours:
-        contour_info.append((
-            c,
-            cv2.isContourConvex(c),
-            cv2.contourArea(c),
-        ))
-    contour_info = sorted(contour_info, key=lambda c: c[2], reverse=True)
-    max_contour = contour_info[0]
     
-    # Create empty mask.
-    mask = np.zeros(edges.shape)
-    cv2.fillConvexPoly(mask, max_contour[0], (255))
+    # Create mask, contour가 없으면 배경을 지우지 않는다.
+    if contours:
+        mask = np.zeros(edges.shape, dtype=np.uint8)
+        cv2.fillConvexPoly(mask, max(contours, key=cv2.contourArea), 255)
+    else:
+        mask = np.full(edges.shape, 255, dtype=np.uint8)
     
     # Smooth mask and blur it.
     mask = cv2.dilate(mask, None, iterations=MASK_DILATE_ITER)
     mask = cv2.erode(mask, None, iterations=MASK_ERODE_ITER)
     mask = cv2.GaussianBlur(mask, (BLUR, BLUR), 0)
-    mask_stack = np.dstack([mask]*3)
     
-    # Blend masked img into MASK_COLOR background
-    mask_stack = mask_stack.astype('float32') / 255.0
-    image = image.astype('float32') / 255.0
-
-    masked = (mask_stack * image) + ((1-mask_stack) * MASK_COLOR)
-    masked = (masked * 255).astype('uint8')
+    # Mask as alpha channel.
+    c_blue, c_green, c_red = cv2.split(image)
     
-    c_red, c_green, c_blue = cv2.split(image)
-    img_a = cv2.merge((c_red, c_green, c_blue, mask.astype('float32') / 255.0))
-
-    return img_a*255
+    return cv2.merge((c_blue, c_green, c_red, mask))
     
     
 def image_to_tensor(image):
@@ -104,87 +127,36 @@ def execute_inference(image):
     Receives image and executes 
     inference against sagemaker endpoint.
     """
-    
-    boto_session = boto3.Session(aws_access_key_id=settings.AWS_ACCESS_KEY_ID, 
-                             aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY)
-    sess = sagemaker.Session(boto_session=boto_session)
-    
-    ENDPOINT_MODEL = 'clothes-30-model'
-
-    predictor = RealTimePredictor(endpoint=ENDPOINT_MODEL,
-                                  sagemaker_session=sess,
-                                content_type='application/json',
-                                accept='application/json')
-    
-    # Convert tensor to JSON format.
-    image = image.tolist()
-    image = json.dumps(image)
+    # 동시 요청은 모아서 한 번에 보낸다(apps/api/inference_batcher.py)
+    if settings.INFERENCE_MAX_BATCH > 1:
+        return get_inference_batcher().predict(image)
 
-    # Get a prediction from the endpoint.
-    result = predictor.predict(image)
-    # Convert result into python dict.
-    result = json.loads(result)
+    # 프로세스 단위로 재사용되는 클라이언트(apps/api/inference.py)
+    return get_inference_client().predict(image)
 
-    return result    
 
-
-def save_image_s3(image, prefix):
+def save_image_s3(image, prefix, folder='temp'):
     """
     Receives image and saves it to s3 bucket,
     returns the url of an uplodaed image.
+    folder : 'temp'(분석 후 확정 전) or 'saved'
     """
-    TEMP_IMAGE_NAME = 'temp/' + prefix + '_' + str(int(round(time.time()*1000))) + '.png'
-    BUCKET_NAME = 'otte-bucket'
-    REGION_NAME = 'ap-northeast-2'
-    
-    cv2.imwrite(TEMP_IMAGE_NAME, image)
-    
-    s3 = boto3.client('s3', aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                      aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY)
+    # 메모리에서 인코딩 후 바로 업로드(임시 파일 x), 같은 ms에 올라와도 이름이 겹치지 않도록 uuid 추가
+    body, extension, content_type = encode_image(image)
+    image_name = prefix + '_' + str(int(round(time.time()*1000))) + '_' + uuid.uuid4().hex[:8] + extension
+    key_name = prefix + '/' + folder + '/' + image_name
     
-    s3.upload_file(TEMP_IMAGE_NAME, BUCKET_NAME, prefix + '/' + TEMP_IMAGE_NAME, ExtraArgs={'ACL':'public-read'})
+    get_s3_client().put_object(Bucket=settings.S3_BUCKET_NAME, Key=key_name, Body=body,
+                               ContentType=content_type, ACL='public-read')
     
-    url = 'https://' + BUCKET_NAME + '.s3.ap-northeast-2.amazonaws.com/' + prefix + '/' + TEMP_IMAGE_NAME
-
-    os.remove(TEMP_IMAGE_NAME)
-
-    return url
+    return get_object_url(key_name)
 
 def move_image_to_saved(image_url, prefix):
     """
-    moves image_url from temp to save on s3 bucket
+    moves image_url from temp to save on s3 bucket,
+    returns the saved url (IMAGE_PROMOTION_MODE에 따라 copy/delete는 나중에 처리될 수 있다)
     """
-    parts = image_url.split('/')
-    
-    BUCKET_NAME = parts[2].split('.')[0]
-    IMAGE_NAME = parts[-1]
-    OBJECT_NAME = prefix + '/temp/' + IMAGE_NAME
-    KEY_NAME = prefix + '/saved/' + IMAGE_NAME
-    
-    COPY_SOURCE = {
-        'Bucket': BUCKET_NAME,
-        'Key': OBJECT_NAME
-    }
-    
-    s3 = boto3.client('s3', aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY)
-    
-    # Copy from temp to saved.
-    try:
-        s3.copy_object(Bucket=BUCKET_NAME, 
-                    CopySource= COPY_SOURCE, 
-                    Key=KEY_NAME,
-                    ACL='public-read')
-    except:
-        raise S3FileError
-    
-    # Delete temp.
-    s3.delete_object(Bucket=BUCKET_NAME,
-                     Key=OBJECT_NAME)
-    
-    moved_url = 'https://' + BUCKET_NAME + '.s3.ap-northeast-2.amazonaws.com/' + KEY_NAME
-    
-    return moved_url
+    return get_image_promoter().promote(image_url, prefix)
 
 def get_categories_from_predictions(predictions):
     """
@@ -221,29 +193,4 @@ def get_weather_class(weather):
     weather: maxTemp/minTemp/windSpeed/humidity
     ex) [20,10,2.5,52.5]
     """
-    weather_types = [
-        [29.7, 22.1, 1.7, 67.3],
-        [23.8, 13.3, 1.9, 61.1],
-        [26.1, 17.7, 2.5, 73.9],
-        [24.4, 12.0, 1.7, 45.9],
-        [25.1, 20.2, 2.5, 92.5],
-        [11.8, 1.2, 1.2, 60.6],
-        [8.7, 0.0, 1.4, 75.8],
-        [20.2, 10.2, 0.5, 76.4],
-        [28.4, 21.3, 1.1, 82.5],
-        [9.3, -1.4, 1.7, 42.6]
-    ]
-    
-    distances = []
-    for weather_type in weather_types:
-        tempSum = 0
-        for i in range(len(weather_type)):
-            dist = weather[i] - weather_type[i]
-            if i == 4:
-                dist = 0.1 * dist
-            tempSum += dist * dist
-        distances.append(math.sqrt(tempSum))
-        
-    typeIndex = distances.index(min(distances))
-    return typeIndex + 1
-    
+    return weather_classifier.classify(weather)
@@ -25,6 +25,9 @@ clothes_query_schema = base_query_params_schema.extend(
 clothes_set_query_schema = base_query_params_schema.extend(
     {
         "style": six.text_type,
+        "review": six.text_type,
+        "min_reviews": IntegerLike(),
+        "weather_type": IntegerLike(),
     }
 )
 
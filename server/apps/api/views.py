@@ -1,24 +1,27 @@
-from bs4 import BeautifulSoup
 import datetime
 from dateutil.parser import parse
-from django.db.models import Avg, Max, Min
+from django.db.models import Count, Exists, OuterRef, Q
 from django.utils import timezone
 from filters.mixins import FiltersMixin
-import json
 import random
-from random import sample
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework_extensions.mixins import NestedViewSetMixin
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
-import requests
 from statistics import mode
 
-from .exceptions import S3FileError
+from .city_index import get_city_index
+from .exceptions import ImageDecodeError, S3FileError
 from .globalweather import get_global_weather_city_name
+from .image_pipeline import analyze_clothes_image
+from .inference_cache import get_classification_cache, image_cache_key
+from .location_registry import get_location_registry
+from .lookbook import get_lookbook_feed
+from .mixins import EagerLoadingMixin
 from .models import Clothes, ClothesSet, ClothesSetReview, User, Weather, CategoryData
 from .permissions import UserPermissions
+from .recommendations import get_today_combinations
 from .serializers import (
     ClothesSerializer,
     ClothesSetSerializer,
@@ -28,6 +31,7 @@ from .serializers import (
     UserSerializer,
     CategoryDataSerializer
 )
+from .storage import create_upload_url
 from .utils import *
 from .validations import (
     user_query_schema, 
@@ -37,11 +41,12 @@ from .validations import (
 )
 from .weather import (
     convert_time,
-    get_weather_date, 
+    get_weather_grid,
     get_weather_between, 
     get_weather_time_date, 
     get_current_weather
 )
+from .weather_summary import get_weather_summary
 
 class UserView(FiltersMixin, NestedViewSetMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
@@ -174,6 +179,8 @@ class ClothesView(FiltersMixin, NestedViewSetMixin, viewsets.ModelViewSet):
         # Move image from temp to saved on s3 storage.
         if 'image_url' in request.data.keys():
             image_url = request.data['image_url']
+            # temp 이미지가 옮겨지거나 없으면 캐시된 분류 결과도 더 이상 쓸 수 없다.
+            get_classification_cache().discard_url(image_url)
             try:
                 request.data['image_url']  = move_image_to_saved(image_url, 'clothes')
             except S3FileError:
@@ -210,24 +217,54 @@ class ClothesView(FiltersMixin, NestedViewSetMixin, viewsets.ModelViewSet):
    
         return super().destroy(request, *args, **kwargs)
  
+    @action(detail=False, methods=['post'])
+    def upload_url(self, request, *args, **kwargs):
+        """
+        An endpoint where a presigned url for uploading an image directly to s3 is returned,
+        the returned key is sent as image_key instead of image
+        """
+        return Response(create_upload_url(request.user.id, 'clothes'), status=status.HTTP_200_OK)
+
     @action(detail=False, methods=['post'])
     def inference(self, request, *args, **kwargs):
         """
         An endpoint where the analysis of a clothes is returned
         """
-        image = byte_to_image(request.data['image'])
-        image_tensor = image_to_tensor(image)
-        inference_result = execute_inference(image_tensor)
-        upper, lower = get_categories_from_predictions(inference_result)
+        try:
+            image = request_image(request.data, request.user.id, 'clothes')
+        except S3FileError:
+            return Response({
+                'error': 'image does not exist ... plesase try again'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        except ImageDecodeError as e:
+            return Response({
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        if image is None:
+            return Response({
+                "error": 'image field is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # 같은 사용자가 같은 이미지를 다시 올린 경우, 분류/업로드 결과 재사용
+        classification_cache = get_classification_cache()
+        cache_key = image_cache_key(request.user.id, image)
+        result = classification_cache.get(cache_key)
+        if result is not None:
+            return Response(result, status=status.HTTP_200_OK)
+
+        # 분류와 배경 제거 + 업로드를 동시에 실행
+        upper, lower, image_url = analyze_clothes_image(image, 'clothes')
         category_id = CategoryData.objects.all().filter(upper_category=upper, lower_category=lower).values('id')
-        image = remove_background(image)
-        image_url = save_image_s3(image, 'clothes')
         
-        return Response({'image_url': image_url, 
-                         'upper_category':upper, 
-                         'lower_category':lower,
-                         'category_id':category_id
-                         }, status=status.HTTP_200_OK)
+        result = {'image_url': image_url, 
+                  'upper_category':upper, 
+                  'lower_category':lower,
+                  'category_id':list(category_id)
+                  }
+        classification_cache.set(cache_key, result)
+
+        return Response(result, status=status.HTTP_200_OK)
 
     @action(detail=False, methods=['get'])
     def today_category(self, request, *args, **kwargs):
@@ -235,54 +272,14 @@ class ClothesView(FiltersMixin, NestedViewSetMixin, viewsets.ModelViewSet):
         An endpoint where the today_category is returned
         """
         
-        MAX_ITEM_NUM = 3
-        MAX_IMAGE_NUM = 3
-
         min_temp = float(request.query_params.get('minTemp'))
         max_temp = float(request.query_params.get('maxTemp'))
         wind_speed = float(request.query_params.get('windSpeed'))
         humidity = float(request.query_params.get('humidity'))
         
         weather_type = get_weather_class([max_temp, min_temp, wind_speed, humidity])
-        # 모든 사용자 중 (날씨 적절성 3 + 현재와 유사한 날씨)인 코디 리뷰 추출
-        filtered_cody_review_set = ClothesSetReview.objects.all().filter(review=3, weather_type=weather_type)
-
-        # 추출된 코디 리뷰의 코디 id 저장
-        filtered_clothes_set_id = []
-        # flat=True : dict 형식으로 변환
-        filtered_clothes_set_id.append(filtered_cody_review_set.values_list('clothes_set', flat=True))
-        
-        # id로 필터링 된 코디 query set
-        filtered_clothes_set = ClothesSet.objects.filter(pk__in=filtered_clothes_set_id)
-        
-        combination_dict = {}
-        for clothes_set in filtered_clothes_set:
-            
-            # 한 코디에 대한 각 옷들의 하위 카테고리 추출
-            category_set = CategoryData.objects.all().filter(id__in=clothes_set.clothes.values_list('category', flat=True))
-            comb = tuple(category_set.values_list('lower_category', flat=True).order_by('lower_category').distinct())
-            if comb in combination_dict.keys():
-                combination_dict[comb][0] += 1
-                combination_dict[comb][1].add(clothes_set.image_url)
-            else:
-                combination_dict[comb] = [1,set([clothes_set.image_url])]
-        
-        result = sorted(combination_dict.items(), key=(lambda x:x[1][0]), reverse=True)[:MAX_ITEM_NUM]
-
-        result_list = []
-        for item in result:
-            item = list(item)
-            result_dict = {}
-            result_dict['combination'] = '-'.join(list(item[0]))
-            images_list = list(item[1][1])
 
-            if len(images_list) > MAX_IMAGE_NUM:
-                images_list = sample(images_list, MAX_IMAGE_NUM)
-
-            result_dict['images'] = images_list
-            result_list.append(result_dict)
-
-        return Response(result_list)
+        return Response(get_today_combinations(weather_type))
 
     
     @action(detail=False, methods=['get'])
@@ -293,43 +290,16 @@ class ClothesView(FiltersMixin, NestedViewSetMixin, viewsets.ModelViewSet):
 
         # 페이지에서 보여줄 패션 스타일 이미지 갯수
         img_num = 5
-        year = str(datetime.datetime.now().year)
         user_gender = 'm' if request.user.gender == 'M' else 'f'
-        url = ''.join(['https://www.musinsa.com/index.php?m=shopstaff&_y=', year, '&ordw=d_regis&gender=', user_gender])
-        
-        div_tag = BeautifulSoup(requests.get(url).text, 'html.parser').find('div', class_='list-box box')
 
-        # img_num 만큼 0~ran_max 랜덤 숫자 뽑기(반복 x)
-        ran_max = 9
-        num_list = []
-        ran_num = random.randint(0, ran_max)
-
-        for i in range(img_num):
-            while ran_num in num_list:
-                ran_num = random.randint(0, ran_max)
-            num_list.append(ran_num)
-
-        li_tag = div_tag.find_all('li', class_='listItem')
-        
-        lookbook_list = []
-        try:
-            for count in range(img_num):
-                ran_li = li_tag[int(num_list[count])]
-                # 이미지 url 받아오기
-                img_url = ran_li.find('img').get('src')
-                # 브랜드명 받아오기
-                brand = ran_li.find('p', class_='brackets brand').text
-                # 모델 이름 받아오기
-                name = ran_li.find('span').text
-                lookbook_list.append({'image' : img_url, 'brand' : brand, 'name' : name})
-        
-        # url 변경 등의 문제로 크롤링 오류 발생 시 예외 처리 
-        except:
+        # 캐시된 목록에서만 뽑는다(목록은 백그라운드에서 갱신).
+        lookbook_list = get_lookbook_feed().get(user_gender)
+        if not lookbook_list:
             return Response({
-                    'error' : 'internal server error'
-                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                'error' : 'lookbook is not ready ... please try again'
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
 
-        return Response(lookbook_list)
+        return Response(random.sample(lookbook_list, min(img_num, len(lookbook_list))))
 
 
 class ClothesNestedView(FiltersMixin, NestedViewSetMixin, viewsets.ModelViewSet):
@@ -348,7 +318,7 @@ class ClothesNestedView(FiltersMixin, NestedViewSetMixin, viewsets.ModelViewSet)
     permission_classes = [IsAuthenticatedOrReadOnly]
 
 
-class ClothesSetView(FiltersMixin, NestedViewSetMixin, viewsets.ModelViewSet):
+class ClothesSetView(EagerLoadingMixin, FiltersMixin, NestedViewSetMixin, viewsets.ModelViewSet):
     def get_queryset(self):
         queryset = ClothesSet.objects.all()
         
@@ -387,13 +357,7 @@ class ClothesSetView(FiltersMixin, NestedViewSetMixin, viewsets.ModelViewSet):
                 'error' : 'token authorization failed ... please log in'
             }, status=status.HTTP_401_UNAUTHORIZED)
             
-        queryset = self.filter_queryset(self.get_queryset())
-        if request.query_params.get('review'):
-            reviews = ClothesSetReview.objects.all()
-        
-            for clothesSet in list(queryset):
-                if len(reviews.filter(clothes_set__id=clothesSet.id)) == 0:
-                    queryset = queryset.exclude(id=clothesSet.id)
+        queryset = ClothesSetView.filter_reviewed(self.filter_queryset(self.get_queryset()), request.query_params)
 
         page = self.paginate_queryset(queryset)
         if page is not None:
@@ -405,14 +369,44 @@ class ClothesSetView(FiltersMixin, NestedViewSetMixin, viewsets.ModelViewSet):
         return Response(serializer.data)
             
     
-    # 요청된 이미지를 s3에 저장 후 url 반환
-    def get_image_url(req_image):
-        image = byte_to_image(req_image)
-        temp_url = save_image_s3(image, 'clothes-sets')
-        image_url = move_image_to_saved(temp_url, 'clothes-sets')
+    # 리뷰가 있는 코디만 반환, 코디별 쿼리 없이 EXISTS / COUNT 하나로 필터링
+    # review : 리뷰가 있는 코디, min_reviews : 리뷰가 n개 이상인 코디, weather_type : 해당 날씨 타입의 리뷰만 셈
+    def filter_reviewed(queryset, query_params):
+        weather_type = query_params.get('weather_type')
+        min_reviews = query_params.get('min_reviews')
+
+        if min_reviews:
+            review_filter = Q(clothessetreview__weather_type=int(weather_type)) if weather_type else Q()
+            return queryset.annotate(
+                review_count=Count('clothessetreview', filter=review_filter)
+            ).filter(review_count__gte=int(min_reviews))
+
+        if query_params.get('review') or weather_type:
+            reviews = ClothesSetReview.objects.filter(clothes_set=OuterRef('pk'))
+            if weather_type:
+                reviews = reviews.filter(weather_type=int(weather_type))
+            return queryset.filter(Exists(reviews))
+
+        return queryset
+
+    # 요청된 이미지(image 또는 image_key)를 s3에 저장 후 url 반환, 이미지가 없으면 None
+    def get_image_url(request):
+        image = request_image(request.data, request.user.id, 'clothes-sets')
+        if image is None:
+            return None
+        # 코디 이미지는 바로 확정되므로 temp를 거치지 않고 saved에 업로드
+        image_url = save_image_s3(image, 'clothes-sets', folder='saved')
 
         return (image_url)
 
+    @action(detail=False, methods=['post'])
+    def upload_url(self, request, *args, **kwargs):
+        """
+        An endpoint where a presigned url for uploading an image directly to s3 is returned,
+        the returned key is sent as image_key instead of image
+        """
+        return Response(create_upload_url(request.user.id, 'clothes-sets'), status=status.HTTP_200_OK)
+
 
     def create(self, request, *args, **kwargs):
         if 'clothes' in request.data.keys():
@@ -428,15 +422,25 @@ class ClothesSetView(FiltersMixin, NestedViewSetMixin, viewsets.ModelViewSet):
                         "error" : "this is not your clothes : " + clothes_id
                     }, status=status.HTTP_200_OK)
         
-        if 'image' in request.data.keys():
-            # 해당 image의 url           
-            request.data['image_url'] = ClothesSetView.get_image_url(request.data['image'])
+        # 해당 image의 url
+        try:
+            image_url = ClothesSetView.get_image_url(request)
+        except S3FileError:
+            return Response({
+                'error': 'image does not exist ... plesase try again'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        except ImageDecodeError as e:
+            return Response({
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        else:
+        if image_url is None:
             return Response({
                 "error": 'image field is required'
             }, status=status.HTTP_400_BAD_REQUEST)
             
+        request.data['image_url'] = image_url
+            
         return super().create(request, *args, **kwargs)
     
     def perform_create(self, serializer):
@@ -450,9 +454,20 @@ class ClothesSetView(FiltersMixin, NestedViewSetMixin, viewsets.ModelViewSet):
                 'error' : 'you are not allowed to access this object'
             }, status=status.HTTP_401_UNAUTHORIZED)
             
-        if 'image' in request.data.keys():
-            # 해당 image의 url             
-            request.data['image_url'] = ClothesSetView.get_image_url(request.data['image'])
+        # 해당 image의 url, 이미지가 없으면 기존 이미지 유지
+        try:
+            image_url = ClothesSetView.get_image_url(request)
+        except S3FileError:
+            return Response({
+                'error': 'image does not exist ... plesase try again'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        except ImageDecodeError as e:
+            return Response({
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if image_url is not None:
+            request.data['image_url'] = image_url
             
         return super().update(request, *args, **kwargs)
     
@@ -467,7 +482,7 @@ class ClothesSetView(FiltersMixin, NestedViewSetMixin, viewsets.ModelViewSet):
         return super().destroy(request, *args, **kwargs)
     
     
-class ClothesSetNestedView(FiltersMixin, NestedViewSetMixin, viewsets.ModelViewSet):
+class ClothesSetNestedView(EagerLoadingMixin, FiltersMixin, NestedViewSetMixin, viewsets.ModelViewSet):
     queryset = ClothesSet.objects.all()
     serializer_class = ClothesSetReadSerializer  
     
@@ -488,7 +503,7 @@ class ClothesSetNestedView(FiltersMixin, NestedViewSetMixin, viewsets.ModelViewS
     permission_classes = [IsAuthenticatedOrReadOnly]
         
         
-class ClothesSetReviewView(FiltersMixin, NestedViewSetMixin, viewsets.ModelViewSet):    
+class ClothesSetReviewView(EagerLoadingMixin, FiltersMixin, NestedViewSetMixin, viewsets.ModelViewSet):    
     def get_queryset(self):
         queryset = ClothesSetReview.objects.all()
         
@@ -549,60 +564,69 @@ class ClothesSetReviewView(FiltersMixin, NestedViewSetMixin, viewsets.ModelViewS
         
         return Response(serializer.data)
 
-    # 외출 시작~끝 날짜, 시간 변환
-    def conv_date_time(start, end, location):
-        start_date = start.split('T')[0]
-        start_time = start.split('T')[1].split(':')
-        end_date = end.split('T')[0]
-        end_time = end.split('T')[1].split(':')
+    # 날씨 DB에 날씨 정보 수집 후 저장
+    def common_weather_create(start, end, location):
+        new_x, new_y = get_location_registry().grid(location)
+        date_list = [start, end]
 
-        # 외출 시작 시간, 시작 년/달/일 -> 변환된 시간, 날짜
-        start_conv_time, start_conv_date = convert_time(start_time[0] + start_time[1], start_date.split('-')[0], start_date.split('-')[1], start_date.split('-')[2])
-        start_conv_time = int(start_conv_time[0] + start_conv_time[1])
-        start_conv_date = start_conv_date[:4] + '-' + start_conv_date[4:6] + '-' + start_conv_date[6:]
+        for date_time in date_list:
+            date = parse(date_time).strftime('%Y-%m-%d %H:%M:%S')
+            # 시간, 년, 월, 일 -> 변환된 시간, 날짜
+            conv_time, conv_date = convert_time(date[11:13] + date[14:16], date[0:4], date[5:7], date[8:10])
 
-        # 외출 끝 시간, 끝 년/달/일 -> 변환된 시간, 날짜
-        end_conv_time, end_conv_date = convert_time(end_time[0] + end_time[1], end_date.split('-')[0], end_date.split('-')[1], end_date.split('-')[2])
-        end_conv_time = int(end_conv_time[0] + end_conv_time[1])
-        end_conv_date = end_conv_date[:4] + '-' + end_conv_date[4:6] + '-' + end_conv_date[6:]
+            # 같은 격자의 날씨가 이미 저장된 경우.
+            if Weather.objects.filter(date=date[0:10], time=conv_time[0:2], x=new_x, y=new_y).exists():
+                continue
+        
+            # 요청 실패(OSError), 응답 파싱 실패(ValueError, KeyError, TypeError)
+            try:
+                response = get_weather_grid(date, new_x, new_y)
+            except (OSError, ValueError, KeyError, TypeError):
+                return Response({
+                    'error' : 'internal server error'
+                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-        return (start_conv_date, end_conv_date, start_conv_time, end_conv_time)
+            # 동시에 들어온 요청이나 수집(drain)이 먼저 저장했으면 그대로 사용(unique_weather_date_time_cell)
+            Weather.objects.get_or_create(date=date[0:10], time=conv_time[0:2], x=new_x, y=new_y, defaults={
+                'temp': response['T3H'], 'sensible_temp': response['WCI'], 'humidity': response['REH'],
+                'wind_speed': response['WSD'], 'precipitation': response['R06'],
+            })
 
-    # 외출 시작~끝에 해당하는 날씨 수집
-    def req_weather_api(location, start_conv_date, end_conv_date, start_conv_time, end_conv_time):
-        # 지역, 시작~끝 날짜에 따른 날씨 필터링
-        weather_data_set = Weather.objects.all().filter(location_code=location).exclude(date__lt=start_conv_date, date__gt=end_conv_date)
-        weather_data_on_start = weather_data_set.exclude(date=start_conv_date, time__lt=start_conv_time)
-        weather_data_on_end = weather_data_on_start.exclude(date=end_conv_date, time__gt=end_conv_time)
+    # 외출 시작~끝 날씨 요약을 request.data에 저장, 오류 시 Response 반환
+    def common_weather_summary(request):
+        start = request.data['start_datetime']
+        end = request.data['end_datetime']
+        location = int(request.data['location'])
 
-        return (weather_data_on_end)
+        # 외출 시작~끝에 해당하는 날씨 요약
+        summary = get_weather_summary(location, start, end)
+        
+        # 해당 날씨 정보가 없을 때
+        if summary['max_temp'] is None:
+            today = datetime.datetime.now() - datetime.timedelta(hours=24)
 
-    # 날씨 DB에 날씨 정보 수집 후 저장
-    def common_weather_create(start, end, location, weather_data_on_end):
-        with open('apps/api/locations/data.json') as json_file:
-            json_data = json.load(json_file)
-                    
-            new_x = int((json_data[str(location)]['x']))
-            new_y = int((json_data[str(location)]['y']))    
-            date_list = [start, end]
-
-            for date_time in date_list:
-                date = date_time.strftime('%Y-%m-%d %H:%M:%S')
-                # 시간, 년, 월, 일 -> 변환된 시간, 날짜
-                conv_time, conv_date = convert_time(date[1].split(':')[0] + date[1].split(':')[1], date[0].split('-')[0], date[0].split('-')[1], date[0].split('-')[2])
+            if parse(start) < today:
+                return Response({
+                    'error' : 'internal server error'
+                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+            # 날씨 DB에 날씨 정보 수집 후 저장
+            error_response = ClothesSetReviewView.common_weather_create(start, end, location)
+            if error_response is not None:
+                return error_response
             
-                try:
-                    response = get_weather_date(date, str(location))
-                except:
-                    return Response({
-                        'error' : 'internal server error'
-                    }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-                            
-                weather_data_on_end.objects.create(location_code=location, date=date[0:10], time=conv_time[0:2], x=new_x, y=new_y,
-                                                    temp=response['T3H'], sensible_temp=response['WCI'], humidity=response['REH'], 
-                                                    wind_speed=response['WSD'], precipitation=response['R06'])
+            summary = get_weather_summary(location, start, end)
+
+        for key, value in summary.items():
+            request.data[key] = value
+        
+        request.data['weather_type'] = get_weather_class([
+            request.data['max_temp'],
+            request.data['min_temp'],
+            request.data['wind_speed'],
+            request.data['humidity'],
+        ])
 
-    
     def create(self, request, *args, **kwargs):
         if 'clothes_set' in request.data:
             filtered_clothes_set = ClothesSet.objects.all().filter(owner_id=request.user.id)
@@ -617,43 +641,9 @@ class ClothesSetReviewView(FiltersMixin, NestedViewSetMixin, viewsets.ModelViewS
                 }, status=status.HTTP_200_OK)
         
         if set(['clothes_set', 'start_datetime', 'end_datetime', 'location', 'review']).issubset(request.data.keys()):
-            start = request.data['start_datetime']
-            end = request.data['end_datetime']
-            location = int(request.data['location'])
-
-            # 외출 시작~끝 날짜, 시간 변환
-            start_conv_date, end_conv_date, start_conv_time, end_conv_time = ClothesSetReviewView.conv_date_time(start, end, location)
-            # 외출 시작~끝에 해당하는 날씨 수집을 위한 api 요청
-            weather_data_on_end = ClothesSetReviewView.req_weather_api(location, start_conv_date, end_conv_date, start_conv_time, end_conv_time)
-            
-            # 해당 날씨 정보가 없을 때
-            if weather_data_on_end.count()==0:
-                today = datetime.datetime.now() - datetime.timedelta(hours=24)
-
-                if parse(start) < today:
-                    return Response({
-                        'error' : 'internal server error'
-                    }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-                else:
-                    # 날씨 DB에 날씨 정보 수집 후 저장
-                    ClothesSetReviewView.common_weather_create(start, end, location, weather_data_on_end)
-                    
-                                                                  
-            request.data['max_temp'] = weather_data_on_end.aggregate(Max('temp'))['temp__max']
-            request.data['min_temp'] = weather_data_on_end.aggregate(Min('temp'))['temp__min']
-            request.data['max_sensible_temp'] = weather_data_on_end.aggregate(Max('sensible_temp'))['sensible_temp__max']
-            request.data['min_sensible_temp'] = weather_data_on_end.aggregate(Min('sensible_temp'))['sensible_temp__min']
-            request.data['humidity'] = weather_data_on_end.aggregate(Avg('humidity'))['humidity__avg']
-            request.data['wind_speed'] = weather_data_on_end.aggregate(Avg('wind_speed'))['wind_speed__avg']
-            request.data['precipitation'] = weather_data_on_end.aggregate(Avg('precipitation'))['precipitation__avg']
-            
-            request.data['weather_type'] = get_weather_class([
-                request.data['max_temp'],
-                request.data['min_temp'],
-                request.data['wind_speed'],
-                request.data['humidity'],
-            ])
+            error_response = ClothesSetReviewView.common_weather_summary(request)
+            if error_response is not None:
+                return error_response
         
         return super(ClothesSetReviewView, self).create(request, *args, **kwargs)
     
@@ -670,44 +660,9 @@ class ClothesSetReviewView(FiltersMixin, NestedViewSetMixin, viewsets.ModelViewS
             }, status=status.HTTP_401_UNAUTHORIZED)
         
         if set(['clothes_set', 'start_datetime', 'end_datetime', 'location', 'review']).issubset(request.data.keys()):
-            start = request.data['start_datetime']
-            end = request.data['end_datetime']
-            location = int(request.data['location'])
-            
-            # 외출 시작~끝 날짜, 시간 변환
-            start_conv_date, end_conv_date, start_conv_time, end_conv_time = ClothesSetReviewView.conv_date_time(start, end, location)
-
-            # 외출 시작~끝에 해당하는 날씨 수집을 위한 api 요청
-            weather_data_on_end = ClothesSetReviewView.req_weather_api(location, start_conv_date, end_conv_date, start_conv_time, end_conv_time)
-            
-            # 해당 날씨 정보가 없을 때
-            if weather_data_on_end.count()==0:
-                today = datetime.datetime.now() - datetime.timedelta(hours=24)
-
-                if parse(start) < today:
-                    return Response({
-                        'error' : 'internal server error'
-                    }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-                else:
-                    # 날씨 DB에 날씨 정보 수집 후 저장
-                    ClothesSetReviewView.common_review_create(start, end, location, weather_data_on_end)
-        
-          
-            request.data['max_temp'] = weather_data_on_end.aggregate(Max('temp'))['temp__max']
-            request.data['min_temp'] = weather_data_on_end.aggregate(Min('temp'))['temp__min']
-            request.data['max_sensible_temp'] = weather_data_on_end.aggregate(Max('sensible_temp'))['sensible_temp__max']
-            request.data['min_sensible_temp'] = weather_data_on_end.aggregate(Min('sensible_temp'))['sensible_temp__min']
-            request.data['humidity'] = weather_data_on_end.aggregate(Avg('humidity'))['humidity__avg']
-            request.data['wind_speed'] = weather_data_on_end.aggregate(Avg('wind_speed'))['wind_speed__avg']
-            request.data['precipitation'] = weather_data_on_end.aggregate(Avg('precipitation'))['precipitation__avg']
-            
-            request.data['weather_type'] = get_weather_class([
-                request.data['max_temp'],
-                request.data['min_temp'],
-                request.data['wind_speed'],
-                request.data['humidity'],
-            ])
+            error_response = ClothesSetReviewView.common_weather_summary(request)
+            if error_response is not None:
+                return error_response
         
         return super(ClothesSetReviewView, self).update(request, *args, **kwargs)
     
@@ -734,37 +689,22 @@ class ClothesSetReviewView(FiltersMixin, NestedViewSetMixin, viewsets.ModelViewS
         limit = request.query_params.get('limit')
         offset = request.query_params.get('offset')
         
-        # Open JSON file for location results.
-        with open('apps/api/locations/data.json') as json_file:
-            data = json.load(json_file)
-            
-        # Get results total count & initial list containing search keyword.    
-        results = []
-        count = 0
-        for index in data:
-            if search in data[index]['full_address']:
-                count += 1
-                results.append({
-                    'id' : index,
-                    'location' : data[index]['full_address']
-                })
-        
-        # Filter list according to limit & offset.
-        final_results = []
         offset = 0 if offset == None else int(offset)
-        limit = count if limit == None else int(limit)
-
-        limit_count = 0        
-        for result in results[offset:]:
-            limit_count += 1
-            final_results.append(result)
-            if limit_count == limit:
-                break
+        limit = None if limit == None else int(limit)
+        prefix = request.query_params.get('prefix') in ('1', 'true')
+        
+        # Get results total count & list filtered by limit & offset from search index.
+        registry = get_location_registry()
+        count, codes = registry.search(search, offset, limit, prefix)
+        final_results = [{
+            'id' : str(code),
+            'location' : registry.address(code)
+        } for code in codes]
         
         # Return response.
         return Response({
                 'count': count,
-                'next': offset + limit_count,
+                'next': offset + len(final_results),
                 'results': final_results,
             }, status=status.HTTP_200_OK)
 
@@ -821,37 +761,24 @@ class ClothesSetReviewView(FiltersMixin, NestedViewSetMixin, viewsets.ModelViewS
         limit = request.query_params.get('limit')
         offset = request.query_params.get('offset')
         
-        # Open JSON file for location results.
-        with open('apps/api/locations/cities_20000.json', 'rt', encoding='UTF-8') as json_file:
-            data = json.load(json_file)
-            
-        # Get results total count & initial list containing search keyword.    
-        results = []
-        count = 0
-        for city in data:
-            if search in city['city_name']:
-                count += 1
-                results.append({
-                    'id': city['city_id'],
-                    'location' : city['city_name']
-                })
-        
-        # Filter list according to limit & offset.
-        final_results = []
         offset = 0 if offset == None else int(offset)
-        limit = count if limit == None else int(limit)
-
-        limit_count = 0        
-        for result in results[offset:]:
-            limit_count += 1
-            final_results.append(result)
-            if limit_count == limit:
-                break
+        limit = None if limit == None else int(limit)
+        
+        # Get results total count & ranked list filtered by limit & offset from city index.
+        city_index = get_city_index()
+        count, positions = city_index.search(search, offset, limit)
+        final_results = []
+        for position in positions:
+            city_id, city_name = city_index.city(position)
+            final_results.append({
+                'id': city_id,
+                'location' : city_name
+            })
         
         # Return response.
         return Response({
                 'count': count,
-                'next': offset + limit_count,
+                'next': offset + len(final_results),
                 'results': final_results,
             }, status=status.HTTP_200_OK)
 
@@ -882,7 +809,7 @@ class ClothesSetReviewView(FiltersMixin, NestedViewSetMixin, viewsets.ModelViewS
                 'precipitation': precipitation,
             }, status=status.HTTP_200_OK)
 
-class ClothesSetReviewNestedView(FiltersMixin, NestedViewSetMixin, viewsets.ModelViewSet):
+class ClothesSetReviewNestedView(EagerLoadingMixin, FiltersMixin, NestedViewSetMixin, viewsets.ModelViewSet):
     queryset = ClothesSetReview.objects.all()
     serializer_class = ClothesSetReviewReadSerializer  
 
@@ -6,6 +6,8 @@ import urllib
 import pprint
 from urllib.request import urlopen
 
+from .location_registry import get_location_registry
+
 ServiceKey = settings.WEATHER_API_KEY
 
 
@@ -14,9 +16,15 @@ def get_weather_date(input_date, location):
      날씨와 장소를 인자로 받아서 날씨 데이터 딕셔너리를 반환한다.
      예시 input_date : 2020-03-31 15:26:23, location : "1" location index
     """
-    with open('apps/api/locations/data.json') as json_file:
-        json_data = json.load(json_file)
+    x, y = get_location_registry().grid(location)
+
+    return get_weather_grid(input_date, x, y)
 
+def get_weather_grid(input_date, x, y): 
+    """
+     날씨와 격자 좌표를 인자로 받아서 날씨 데이터 딕셔너리를 반환한다.
+     예시 input_date : 2020-03-31 15:26:23, x : 60, y : 127
+    """
     date = input_date.split()
     year_month_day = date[0].split('-')
     year = year_month_day[0]
@@ -31,23 +39,34 @@ def get_weather_date(input_date, location):
     # TODO : print 지우고 commit
     print(convert_api_date)
 
+    api_url = get_vilage_fcst_url(convert_api_date, convert_api_time, x, y)
+    data = urllib.request.urlopen(api_url).read().decode('utf8')
+    # TODO : print 지우고 commit
+    print(data)
+
+    return parse_vilage_fcst(data)
+
+def get_vilage_fcst_url(base_date, base_time, x, y):
+    """
+     동네예보(VilageFcst) 요청 URL을 반환한다.
+     예시 base_date : 20200331, base_time : 1400, x : 60, y : 127
+    """
     url = "http://apis.data.go.kr/1360000/VilageFcstInfoService/getVilageFcst?"
     key = "serviceKey=" + ServiceKey
     numOfRows = "&numOfRows=100"
     typeOfData = "&dataType=JSON"
-    date = "&base_date=" + convert_api_date
-    time = "&base_time=" + convert_api_time
+    date = "&base_date=" + base_date
+    time = "&base_time=" + base_time
 
-    x = (json_data[str(location)]['x'])
-    y = (json_data[str(location)]['y'])
+    nx = "&nx=" + str(x)
+    ny = "&ny=" + str(y)
 
-    nx = "&nx=" + x
-    ny = "&ny=" + y
+    return url + key + numOfRows + typeOfData + date + time + nx + ny
 
-    api_url = url + key + numOfRows + typeOfData + date + time + nx + ny
-    data = urllib.request.urlopen(api_url).read().decode('utf8')
-    # TODO : print 지우고 commit
-    print(data)
+def parse_vilage_fcst(data):
+    """
+     동네예보(VilageFcst) 응답 JSON 문자열을 날씨 데이터 딕셔너리로 변환한다.
+    """
     data_json = json.loads(data)
     # get date and time
     parsed_json = data_json['response']['body']['items']['item']
@@ -87,9 +106,6 @@ def get_weather_time_date(date, time, location):
     # convert_time으로 변환된 시간과 장소를 입력 받아 get_weather_between에 필요한 기상 데이터를 딕셔너니로 반환한다.
     # 예시 : 2020-04-07 08:45, 2020-04-07 22:24, location : "1" location index
 
-    with open('apps/api/locations/data.json') as json_file:
-        json_data = json.load(json_file)
-
     api_date = date
     api_time = time
 
@@ -100,11 +116,10 @@ def get_weather_time_date(date, time, location):
     date = "&base_date=" + api_date
     time = "&base_time=" + api_time
 
-    x = (json_data[str(location)]['x'])
-    y = (json_data[str(location)]['y'])
+    x, y = get_location_registry().grid(location)
 
-    nx = "&nx=" + x
-    ny = "&ny=" + y
+    nx = "&nx=" + str(x)
+    ny = "&ny=" + str(y)
 
     api_url = url + key + numOfRows + typeOfData + date + time + nx + ny
     data = urllib.request.urlopen(api_url).read().decode('utf8')
@@ -149,9 +164,6 @@ def get_weather_between(start_input_date, end_input_date, location):
      입력 받은 두 기간 내의 최저 최고 온도를 받으며 날씨 데이터를 weather_data로 반환한다.
      예시 : 2020-04-07 08:45, 2020-04-07 22:24, location : "1" location index
     """
-    with open('apps/api/locations/data_full_address.json') as json_file:
-        json_data = json.load(json_file)
-
     start_date = start_input_date.split()
     start_year_month_day= start_date[0].split('-')
     start_year = start_year_month_day[0]
@@ -265,9 +277,6 @@ def get_current_weather(location):
     location : "1" location index
     제공되는 날씨 데이터에서 최저 최고 기온은 기상예보에서 받아온 이후 3~4시간 내에서의 최저 최고 기온이다.
     """
-    with open('apps/api/locations/data.json') as json_file:
-        json_data = json.load(json_file)
-
     now = datetime.datetime.now()
 
     # 현재 시간
@@ -301,11 +310,10 @@ def get_current_weather(location):
     date = "&base_date=" + convert_api_date
     time = "&base_time=" + convert_api_time
 
-    x = (json_data[str(location)]['x'])
-    y = (json_data[str(location)]['y'])
+    x, y = get_location_registry().grid(location)
 
-    nx = "&nx=" + x
-    ny = "&ny=" + y
+    nx = "&nx=" + str(x)
+    ny = "&ny=" + str(y)
 
     api_url = url + key + numOfRows + typeOfData + date + time + nx + ny
     data = urllib.request.urlopen(api_url).read().decode('utf8')
@@ -0,0 +1,45 @@
+# 날씨 벡터(maxTemp/minTemp/windSpeed/humidity) -> weather_type 분류기.
+import numpy as np
+
+# weather_type 1~10의 중심 벡터 : maxTemp/minTemp/windSpeed/humidity
+WEATHER_TYPE_CENTROIDS = [
+    [29.7, 22.1, 1.7, 67.3],
+    [23.8, 13.3, 1.9, 61.1],
+    [26.1, 17.7, 2.5, 73.9],
+    [24.4, 12.0, 1.7, 45.9],
+    [25.1, 20.2, 2.5, 92.5],
+    [11.8, 1.2, 1.2, 60.6],
+    [8.7, 0.0, 1.4, 75.8],
+    [20.2, 10.2, 0.5, 76.4],
+    [28.4, 21.3, 1.1, 82.5],
+    [9.3, -1.4, 1.7, 42.6],
+]
+
+# 항목별 거리 가중치.
+WEATHER_FEATURE_WEIGHTS = [1.0, 1.0, 1.0, 1.0]
+
+
+class WeatherClassifier:
+    """
+    Nearest-centroid classifier over weighted Euclidean distance.
+    """
+    def __init__(self, centroids=WEATHER_TYPE_CENTROIDS, weights=WEATHER_FEATURE_WEIGHTS):
+        self.centroids = np.asarray(centroids, dtype=np.float64)
+        self.weights = np.asarray(weights, dtype=np.float64)
+
+    def classify(self, weather):
+        """
+        returns weather_type of one vector, or an array of weather_types of an N x 4 array
+        ex) [20,10,2.5,52.5] -> 4
+        """
+        vectors = np.asarray(weather, dtype=np.float64)
+        single = vectors.ndim == 1
+
+        diff = (np.atleast_2d(vectors)[:, np.newaxis, :] - self.centroids) * self.weights
+        distances = np.einsum('ijk,ijk->ij', diff, diff)
+        weather_types = distances.argmin(axis=1) + 1
+
+        return int(weather_types[0]) if single else weather_types
+
+
+weather_classifier = WeatherClassifier()
@@ -0,0 +1,92 @@
+# 동네예보(VilageFcst) 병렬 요청 모듈.
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+import requests
+from requests.adapters import HTTPAdapter
+import threading
+import time
+
+from .weather import get_vilage_fcst_url, parse_vilage_fcst
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+    rate : 초당 허용 요청 수, capacity : 한 번에 몰아서 보낼 수 있는 최대 요청 수
+    """
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        blocks until a token is available
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+class ForecastFetcher:
+    """
+    Fetches VilageFcst forecasts for many grid cells concurrently,
+    sharing one keep-alive session and a token bucket rate limit.
+    """
+    def __init__(self, concurrency=None, rate=None, timeout=None, session=None):
+        self.concurrency = concurrency or settings.WEATHER_FETCH_CONCURRENCY
+        self.timeout = timeout or settings.WEATHER_FETCH_TIMEOUT
+        self.rate_limiter = TokenBucket(rate or settings.WEATHER_FETCH_RATE)
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
+
+    def fetch(self, base_date, base_time, x, y):
+        """
+        returns weather data dict of the grid cell (x, y)
+        예시 base_date : 20200331, base_time : 1400
+        """
+        self.rate_limiter.acquire()
+
+        response = self.session.get(get_vilage_fcst_url(base_date, base_time, x, y), timeout=self.timeout)
+        response.raise_for_status()
+
+        return parse_vilage_fcst(response.content.decode('utf8'))
+
+    def fetch_many(self, base_date, base_time, cells):
+        """
+        fetches every grid cell, returns (results, failures)
+        results : {(x, y): weather data}, failures : {(x, y): exception}
+        """
+        results = {}
+        failures = {}
+
+        def fetch_cell(cell):
+            try:
+                results[cell] = self.fetch(base_date, base_time, *cell)
+            except Exception as e:
+                failures[cell] = e
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            list(executor.map(fetch_cell, cells))
+
+        return (results, failures)
+
+    def close(self):
+        self.session.close()
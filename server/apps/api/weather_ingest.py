@@ -0,0 +1,170 @@
+# 동네예보 날씨 수집(ingestion) 파이프라인. scripts/save_weather.py에서 사용.
+import datetime
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+import logging
+import random
+import threading
+import time
+
+from .location_registry import get_location_registry
+from .models import Weather, WeatherFetchTask
+from .weather import convert_time
+from .weather_fetcher import ForecastFetcher
+
+logger = logging.getLogger(__name__)
+
+# 한 프로세스에서는 drain을 하나씩만 실행(시작 시 drain, 예약된 ingest가 겹칠 수 있다).
+_drain_lock = threading.Lock()
+
+
+def build_weather(date, base_time, x, y, response):
+    """
+    returns unsaved Weather row of the grid cell (x, y)
+    예시 date : 2020-05-28, base_time : 20
+    """
+    # WCI 체감온도 T3H 기온 WSD 풍속 REH 습도 R06 강수량
+    return Weather(date=date, time=base_time, x=x, y=y,
+                   temp=response['T3H'], sensible_temp=response['WCI'], humidity=response['REH'],
+                   wind_speed=response['WSD'], precipitation=response['R06'])
+
+
+def save_weathers(weathers, batch_size=None):
+    """
+    writes Weather rows with bulk INSERTs of batch_size inside one transaction
+    """
+    batch_size = batch_size or settings.WEATHER_BULK_BATCH_SIZE
+
+    with transaction.atomic():
+        Weather.objects.bulk_create(weathers, batch_size=batch_size, ignore_conflicts=True)
+
+
+def retry_delay(attempts):
+    """
+    returns seconds to wait before the next attempt,
+    exponential backoff with jitter : base * 2^(attempts-1), max_delay 이하
+    """
+    delay = min(settings.WEATHER_RETRY_MAX_DELAY,
+                settings.WEATHER_RETRY_BASE_DELAY * (2 ** (attempts - 1)))
+
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def enqueue(now):
+    """
+    now(기준 시각)에 아직 저장되지 않은 격자마다 WeatherFetchTask를 추가한다.
+    예시 now : 2020-05-28 20:30:00
+    """
+    date = now.split()
+    year_month_day = date[0].split('-')
+    year = year_month_day[0]
+    month = year_month_day[1]
+    day = year_month_day[2]
+
+    conv_time = date[1].split(':')
+    conv_time = conv_time[0] + conv_time[1]
+    conv_time, conv_date = convert_time(conv_time, year, month, day)
+
+    # 같은 격자를 공유하는 지역 코드들은 한 번만 요청.
+    saved_cells = set(Weather.objects.filter(date=now[0:10], time=conv_time[0:2]).values_list('x', 'y'))
+    tasks = [
+        WeatherFetchTask(date=now[0:10], time=int(conv_time[0:2]), base_date=conv_date, x=x, y=y)
+        for x, y in get_location_registry().cells() if (x, y) not in saved_cells
+    ]
+
+    # 이전 실행에서 남은 task는 시도 횟수를 유지한다.
+    WeatherFetchTask.objects.bulk_create(tasks, batch_size=settings.WEATHER_BULK_BATCH_SIZE, ignore_conflicts=True)
+
+
+def claim_due_tasks(now):
+    """
+    returns due tasks after pushing their next_attempt_at to the lease end,
+    so that drains of other processes skip them until the lease expires
+    """
+    # SKIP LOCKED이 없는 DB(MySQL < 8.0.1, MariaDB < 10.6)에서는 다른 drain의 claim이 끝날 때까지 기다린다.
+    skip_locked = connection.features.has_select_for_update_skip_locked
+
+    with transaction.atomic():
+        due_tasks = list(WeatherFetchTask.objects.select_for_update(skip_locked=skip_locked).filter(
+            attempts__lt=settings.WEATHER_RETRY_MAX_ATTEMPTS, next_attempt_at__lte=now))
+
+        # 처리 중 worker가 죽으면 lease가 끝난 뒤 다시 처리된다.
+        lease_until = now + datetime.timedelta(seconds=settings.WEATHER_FETCH_LEASE)
+        ids = [task.id for task in due_tasks]
+        for i in range(0, len(ids), settings.WEATHER_BULK_BATCH_SIZE):
+            WeatherFetchTask.objects.filter(id__in=ids[i:i + settings.WEATHER_BULK_BATCH_SIZE]).update(next_attempt_at=lease_until)
+
+    return due_tasks
+
+
+def process_due_tasks(fetcher):
+    """
+    fetches every due task, saves succeeded weathers and reschedules failed ones.
+    returns the number of processed tasks
+    """
+    now = timezone.now()
+    due_tasks = claim_due_tasks(now)
+
+    # 기준 시각(base_date, time)별로 묶어서 요청.
+    slots = {}
+    for task in due_tasks:
+        slots.setdefault((task.base_date, task.time), []).append(task)
+
+    for (base_date, base_time), tasks in slots.items():
+        tasks_by_cell = {(task.x, task.y): task for task in tasks}
+        results, failures = fetcher.fetch_many(base_date, '%02d00' % base_time, list(tasks_by_cell))
+
+        with transaction.atomic():
+            save_weathers([
+                build_weather(tasks_by_cell[cell].date, base_time, cell[0], cell[1], response)
+                for cell, response in results.items()
+            ])
+            WeatherFetchTask.objects.filter(id__in=[tasks_by_cell[cell].id for cell in results]).delete()
+
+            for cell, error in failures.items():
+                task = tasks_by_cell[cell]
+                task.attempts += 1
+                task.next_attempt_at = timezone.now() + datetime.timedelta(seconds=retry_delay(task.attempts))
+                task.last_error = repr(error)[:200]
+                task.save(update_fields=['attempts', 'next_attempt_at', 'last_error'])
+
+                if task.attempts >= settings.WEATHER_RETRY_MAX_ATTEMPTS:
+                    logger.error('giving up weather fetch of (%d, %d) at %s %02d00 after %d attempts : %s',
+                                 task.x, task.y, task.base_date, task.time, task.attempts, task.last_error)
+
+    return len(due_tasks)
+
+
+def drain():
+    """
+    pending task가 없어질 때까지(또는 최대 시도 횟수를 넘길 때까지) 수집한다.
+    중단됐던 worker는 이 함수로 남은 task를 이어서 처리한다.
+    이미 실행 중인 drain이 있으면 끝날 때까지 기다린 뒤 남은 task를 처리한다.
+    """
+    with _drain_lock:
+        fetcher = ForecastFetcher()
+
+        try:
+            while True:
+                if process_due_tasks(fetcher) != 0:
+                    continue
+
+                next_task = (WeatherFetchTask.objects
+                             .filter(attempts__lt=settings.WEATHER_RETRY_MAX_ATTEMPTS)
+                             .order_by('next_attempt_at').first())
+                if next_task is None:
+                    break
+
+                time.sleep(max(0, (next_task.next_attempt_at - timezone.now()).total_seconds()))
+        finally:
+            fetcher.close()
+
+
+def ingest(now):
+    """
+    now(기준 시각)의 날씨를 격자(x, y)마다 한 번씩 받아 저장한다.
+    예시 now : 2020-05-28 20:30:00
+    """
+    enqueue(now)
+    drain()
@@ -0,0 +1,71 @@
+# 외출 시작~끝 기간 동안의 날씨 요약(최고/최저 기온, 평균 습도 등) 서비스.
+from django.db.models import Avg, Max, Min
+
+from .location_registry import get_location_registry
+from .models import Weather
+from .weather import convert_time
+
+# 요약 항목 -> 집계 함수, 한 번의 aggregate 쿼리로 계산한다.
+SUMMARY_AGGREGATES = {
+    'max_temp': Max('temp'),
+    'min_temp': Min('temp'),
+    'max_sensible_temp': Max('sensible_temp'),
+    'min_sensible_temp': Min('sensible_temp'),
+    'humidity': Avg('humidity'),
+    'wind_speed': Avg('wind_speed'),
+    'precipitation': Avg('precipitation'),
+}
+
+
+def conv_date_time(start, end):
+    """
+    외출 시작~끝 날짜, 시간을 Weather의 날짜, 시간으로 변환한다.
+    예시 start : 2020-05-28T10:30, end : 2020-05-28T18:00
+    """
+    start_date = start.split('T')[0]
+    start_time = start.split('T')[1].split(':')
+    end_date = end.split('T')[0]
+    end_time = end.split('T')[1].split(':')
+
+    # 외출 시작 시간, 시작 년/달/일 -> 변환된 시간, 날짜
+    start_conv_time, start_conv_date = convert_time(start_time[0] + start_time[1], start_date.split('-')[0], start_date.split('-')[1], start_date.split('-')[2])
+    start_conv_time = int(start_conv_time[0] + start_conv_time[1])
+    start_conv_date = start_conv_date[:4] + '-' + start_conv_date[4:6] + '-' + start_conv_date[6:]
+
+    # 외출 끝 시간, 끝 년/달/일 -> 변환된 시간, 날짜
+    end_conv_time, end_conv_date = convert_time(end_time[0] + end_time[1], end_date.split('-')[0], end_date.split('-')[1], end_date.split('-')[2])
+    end_conv_time = int(end_conv_time[0] + end_conv_time[1])
+    end_conv_date = end_conv_date[:4] + '-' + end_conv_date[4:6] + '-' + end_conv_date[6:]
+
+    return (start_conv_date, end_conv_date, start_conv_time, end_conv_time)
+
+
+def get_weather_queryset(location, start_conv_date, end_conv_date, start_conv_time, end_conv_time):
+    """
+    returns Weather queryset of the location between converted start~end
+    """
+    # 지역 -> 격자 변환 후 격자, 시작~끝 날짜에 따른 날씨 필터링
+    x, y = get_location_registry().grid(location)
+    weather_data_set = Weather.objects.all().filter(x=x, y=y, date__gte=start_conv_date, date__lte=end_conv_date)
+    weather_data_on_start = weather_data_set.exclude(date=start_conv_date, time__lt=start_conv_time)
+    weather_data_on_end = weather_data_on_start.exclude(date=end_conv_date, time__gt=end_conv_time)
+
+    return weather_data_on_end
+
+
+def summarize_weather(queryset):
+    """
+    returns every summary statistic of the Weather queryset with one query,
+    values are None if the queryset is empty
+    """
+    return queryset.aggregate(**SUMMARY_AGGREGATES)
+
+
+def get_weather_summary(location, start, end):
+    """
+    returns weather summary of the location between start~end
+    예시 location : 1, start : 2020-05-28T10:30, end : 2020-05-28T18:00
+    """
+    weather_data = get_weather_queryset(location, *conv_date_time(start, end))
+
+    return summarize_weather(weather_data)
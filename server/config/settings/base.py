@@ -51,7 +51,7 @@ THIRD_PARTY_APPS = (
 
 # Applications implemented.
 LOCAL_APPS = (
-    'apps.api',
+    'apps.api.apps.ApiConfig',
 )
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -123,6 +123,24 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/3.0/ref/settings/#caches
+# 'shared' is visible to every api worker and script process(python manage.py createcachetable).
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'api_shared_cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': config('SHARED_CACHE_MAX_ENTRIES', default=10000, cast=int),
+        },
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.0/ref/settings/#auth-password-validators
 
@@ -179,7 +197,97 @@ SIMPLE_JWT = {
 # AWS
 AWS_ACCESS_KEY_ID = config('AWS_ACCESS_KEY_ID')
 AWS_SECRET_ACCESS_KEY = config('AWS_SECRET_ACCESS_KEY')
+S3_BUCKET_NAME = config('S3_BUCKET_NAME', default='otte-bucket')
+S3_REGION = config('S3_REGION', default='ap-northeast-2')
+S3_MAX_POOL_CONNECTIONS = config('S3_MAX_POOL_CONNECTIONS', default=20, cast=int)
+# Overrides the S3 endpoint url, ex) a local S3 stub server.
+S3_ENDPOINT_URL = config('S3_ENDPOINT_URL', default='')
+# Direct uploads through presigned POST(upload_url) : max object bytes, seconds until the url expires.
+IMAGE_UPLOAD_MAX_BYTES = config('IMAGE_UPLOAD_MAX_BYTES', default=10 * 1024 * 1024, cast=int)
+IMAGE_UPLOAD_URL_EXPIRES = config('IMAGE_UPLOAD_URL_EXPIRES', default=300, cast=int)
+# Days until S3 expires uploaded originals that were never used(configure_s3_lifecycle).
+IMAGE_UPLOAD_EXPIRE_DAYS = config('IMAGE_UPLOAD_EXPIRE_DAYS', default=1, cast=int)
+# Hard caps on a decoded image : encoded bytes, pixels(width x height read from the header).
+IMAGE_DECODE_MAX_BYTES = config('IMAGE_DECODE_MAX_BYTES', default=10 * 1024 * 1024, cast=int)
+IMAGE_DECODE_MAX_PIXELS = config('IMAGE_DECODE_MAX_PIXELS', default=40 * 1000 * 1000, cast=int)
+# Uploaded image format : 'png' or 'webp'(smaller, slower to encode).
+IMAGE_UPLOAD_FORMAT = config('IMAGE_UPLOAD_FORMAT', default='png')
+# PNG zlib level 0~9(OpenCV default 1), WebP quality 1~100(above 100 is lossless).
+IMAGE_PNG_COMPRESSION = config('IMAGE_PNG_COMPRESSION', default=1, cast=int)
+IMAGE_WEBP_QUALITY = config('IMAGE_WEBP_QUALITY', default=90, cast=int)
+# Promotion of temp images to saved on create : 'sync'(copy + delete),
+# 'deferred_delete'(copy, temp deleted in background batches) or 'async'(both in background).
+IMAGE_PROMOTION_MODE = config('IMAGE_PROMOTION_MODE', default='deferred_delete')
+IMAGE_PROMOTION_WORKERS = config('IMAGE_PROMOTION_WORKERS', default=4, cast=int)
+# Temp objects per delete_objects request(max 1000) and seconds to wait for a batch.
+IMAGE_TEMP_DELETE_BATCH = config('IMAGE_TEMP_DELETE_BATCH', default=1000, cast=int)
+IMAGE_TEMP_DELETE_WAIT = config('IMAGE_TEMP_DELETE_WAIT', default=1.0, cast=float)
+# Days until S3 expires leftover temp images(configure_s3_lifecycle).
+IMAGE_TEMP_EXPIRE_DAYS = config('IMAGE_TEMP_EXPIRE_DAYS', default=1, cast=int)
+
+# Clothes classification
+# 'sagemaker' or 'stub'(local stand-in for tests and benchmarks).
+INFERENCE_CLIENT = config('INFERENCE_CLIENT', default='sagemaker')
+SAGEMAKER_ENDPOINT_NAME = config('SAGEMAKER_ENDPOINT_NAME', default='clothes-30-model')
+SAGEMAKER_REGION = config('SAGEMAKER_REGION', default='ap-northeast-2')
+# Overrides the runtime endpoint url, ex) a local stub server.
+SAGEMAKER_ENDPOINT_URL = config('SAGEMAKER_ENDPOINT_URL', default='')
+# Connection pool size, timeouts(seconds) and retry attempts of the runtime client.
+SAGEMAKER_MAX_POOL_CONNECTIONS = config('SAGEMAKER_MAX_POOL_CONNECTIONS', default=10, cast=int)
+SAGEMAKER_CONNECT_TIMEOUT = config('SAGEMAKER_CONNECT_TIMEOUT', default=2, cast=float)
+SAGEMAKER_READ_TIMEOUT = config('SAGEMAKER_READ_TIMEOUT', default=10, cast=float)
+SAGEMAKER_MAX_ATTEMPTS = config('SAGEMAKER_MAX_ATTEMPTS', default=3, cast=int)
+# Request body of the endpoint : 'json'(float lists), 'npy'(float32 .npy) or 'jpeg'(224 x 224 JPEG).
+# The endpoint's input handler must accept the chosen content type.
+INFERENCE_PAYLOAD_FORMAT = config('INFERENCE_PAYLOAD_FORMAT', default='json')
+INFERENCE_JPEG_QUALITY = config('INFERENCE_JPEG_QUALITY', default=90, cast=int)
+# Micro-batching of concurrent inference requests : up to max batch images or max wait(seconds).
+# INFERENCE_MAX_BATCH = 1 sends every request on its own, so does the 'jpeg' payload(one image per request).
+INFERENCE_MAX_BATCH = config('INFERENCE_MAX_BATCH', default=8, cast=int)
+INFERENCE_MAX_WAIT = config('INFERENCE_MAX_WAIT', default=0.005, cast=float)
+# Batches in flight to the endpoint at once.
+INFERENCE_BATCH_CONCURRENCY = config('INFERENCE_BATCH_CONCURRENCY', default=4, cast=int)
+
+# Worker threads shared by the clothes image stages(background removal + upload).
+IMAGE_PIPELINE_WORKERS = config('IMAGE_PIPELINE_WORKERS', default=8, cast=int)
+# Cache of classification results by image content : 'locmem', 'django'(CACHES alias) or 'none'.
+# 'locmem' is per process : with more than one worker another worker can still return a temp image_url
+# that was promoted and deleted, so use it only with a single worker.
+CLASSIFICATION_CACHE = config('CLASSIFICATION_CACHE', default='django')
+CLASSIFICATION_CACHE_ALIAS = config('CLASSIFICATION_CACHE_ALIAS', default='shared')
+# Max entries of 'locmem' and seconds until an entry expires.
+CLASSIFICATION_CACHE_SIZE = config('CLASSIFICATION_CACHE_SIZE', default=1024, cast=int)
+CLASSIFICATION_CACHE_TTL = config('CLASSIFICATION_CACHE_TTL', default=3600, cast=int)
+
+# Lookbook feed cached per gender : CACHES alias, seconds until a refresh(ttl),
+# seconds stale items are still served while refreshing, fetch timeout.
+LOOKBOOK_CACHE_ALIAS = config('LOOKBOOK_CACHE_ALIAS', default='shared')
+LOOKBOOK_TTL = config('LOOKBOOK_TTL', default=30 * 60, cast=int)
+LOOKBOOK_STALE_TTL = config('LOOKBOOK_STALE_TTL', default=24 * 60 * 60, cast=int)
+LOOKBOOK_FETCH_TIMEOUT = config('LOOKBOOK_FETCH_TIMEOUT', default=5, cast=float)
+# Minutes between scheduled refreshes(scripts/refresh_lookbook.py).
+LOOKBOOK_REFRESH_INTERVAL = config('LOOKBOOK_REFRESH_INTERVAL', default=10, cast=int)
 
 # Weather
 WEATHER_API_KEY = config('WEATHER_API_KEY')
 GLOBAL_WEATHER_API_KEY = config('GLOBAL_WEATHER_API_KEY')
+
+# Weather ingestion(scripts/save_weather.py)
+# Number of concurrent VilageFcst requests.
+WEATHER_FETCH_CONCURRENCY = config('WEATHER_FETCH_CONCURRENCY', default=8, cast=int)
+# Requests per second allowed by the public API quota.
+WEATHER_FETCH_RATE = config('WEATHER_FETCH_RATE', default=20, cast=float)
+# Per-request timeout in seconds.
+WEATHER_FETCH_TIMEOUT = config('WEATHER_FETCH_TIMEOUT', default=10, cast=float)
+# Rows per bulk INSERT when saving fetched weather.
+WEATHER_BULK_BATCH_SIZE = config('WEATHER_BULK_BATCH_SIZE', default=500, cast=int)
+# Retry of failed requests : exponential backoff(seconds) with jitter, up to max attempts.
+WEATHER_RETRY_BASE_DELAY = config('WEATHER_RETRY_BASE_DELAY', default=30, cast=float)
+WEATHER_RETRY_MAX_DELAY = config('WEATHER_RETRY_MAX_DELAY', default=1800, cast=float)
+WEATHER_RETRY_MAX_ATTEMPTS = config('WEATHER_RETRY_MAX_ATTEMPTS', default=6, cast=int)
+# Seconds a claimed task is hidden from other drains while it is being fetched.
+WEATHER_FETCH_LEASE = config('WEATHER_FETCH_LEASE', default=600, cast=int)
+
+# today_category
+# Number of clothes set image urls kept per (weather_type, combination) counter.
+COMBINATION_IMAGE_RESERVOIR_SIZE = config('COMBINATION_IMAGE_RESERVOIR_SIZE', default=20, cast=int)
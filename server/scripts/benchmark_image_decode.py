@@ -0,0 +1,61 @@
+# 업로드 이미지 디코딩 시간, 최대 메모리 측정 스크립트(전체 디코딩 후 축소 vs 축소 디코딩).
+# 사용법 : python manage.py runscript benchmark_image_decode [--script-args <image dir>]
+# image dir이 없으면 12MP(4032x3024) JPEG를 만들어 측정한다.
+import cv2.cv2 as cv2
+import numpy as np
+from pathlib import Path
+import statistics
+import time
+import tracemalloc
+
+from apps.api.utils import bytes_to_image
+
+MAX_WIDTH = 400
+REPEAT = 20
+
+
+def full_decode(data):
+    # 이전 방식 : 복사 후 원본 해상도로 디코딩, 그 다음 축소
+    image = cv2.imdecode(np.fromstring(data, dtype=np.uint8), 1)
+    if image.shape[1] > MAX_WIDTH:
+        ratio = float(MAX_WIDTH) / image.shape[1]
+        image = cv2.resize(image, (MAX_WIDTH, int(image.shape[0] * ratio)), interpolation=cv2.INTER_AREA)
+    return image
+
+
+def synthetic_jpeg():
+    x = np.linspace(0, 255, 4032, dtype=np.uint8)
+    y = np.linspace(0, 255, 3024, dtype=np.uint8)
+    image = np.dstack([np.add.outer(y, x) // 2, np.tile(x, (3024, 1)), np.tile(y[:, None], (1, 4032))])
+    image = (image + np.random.randint(0, 16, image.shape, dtype=np.uint8)).astype(np.uint8)
+    return cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes()
+
+
+def measure(decode, data):
+    latencies = []
+    for i in range(REPEAT):
+        started = time.perf_counter()
+        decode(data)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    decode(data)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return (statistics.median(latencies), peak)
+
+
+def run(*args):
+    if args:
+        paths = sorted(path for path in Path(args[0]).iterdir() if path.suffix.lower() in ('.png', '.jpg', '.jpeg'))
+        samples = [(path.name, path.read_bytes()) for path in paths]
+    else:
+        samples = [('synthetic 4032x3024.jpg', synthetic_jpeg())]
+
+    print('%-30s %9s %12s %12s %12s %12s' % ('image', 'KB', 'full ms', 'full peak KB', 'new ms', 'new peak KB'))
+    for name, data in samples:
+        full_ms, full_peak = measure(full_decode, data)
+        new_ms, new_peak = measure(bytes_to_image, data)
+        print('%-30s %9d %12.2f %12d %12.2f %12d' % (
+            name, len(data) // 1024, full_ms, full_peak // 1024, new_ms, new_peak // 1024))
@@ -0,0 +1,69 @@
+# 추론 micro-batching 처리량/지연 시간 측정 스크립트.
+# 사용법 : python manage.py runscript benchmark_inference_batching
+# 실제 endpoint 대신 요청당 고정 지연 + 이미지당 지연이 있고,
+# 동시에 ENDPOINT_WORKERS 개의 요청만 처리하는 stub 클라이언트를 사용한다.
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import threading
+import time
+
+from apps.api.inference import StubInferenceClient
+from apps.api.inference_batcher import InferenceBatcher
+
+# stub endpoint 지연(초) : 요청당 + 이미지당
+REQUEST_LATENCY = 0.030
+IMAGE_LATENCY = 0.003
+ENDPOINT_WORKERS = 2
+
+CONCURRENCY = 32
+REQUESTS = 320
+SETTINGS = [
+    # (max_batch, max_wait)
+    (1, 0.0),
+    (4, 0.002),
+    (8, 0.005),
+    (16, 0.005),
+    (16, 0.020),
+    (32, 0.020),
+]
+
+
+class LimitedStubClient(StubInferenceClient):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._workers = threading.Semaphore(ENDPOINT_WORKERS)
+
+    def predict(self, tensor):
+        with self._workers:
+            return super().predict(tensor)
+
+
+def measure(predict):
+    tensor = np.zeros((1, 224, 224, 3), dtype=np.float32)
+
+    def request(_):
+        started = time.perf_counter()
+        predict(tensor)
+        return (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as executor:
+        latencies = sorted(executor.map(request, range(REQUESTS)))
+    elapsed = time.perf_counter() - started
+
+    return (REQUESTS / elapsed, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.95)])
+
+
+def run():
+    print('%9s %9s %9s %10s %9s %9s' % ('max_batch', 'max_wait', 'requests', 'req/s', 'p50 ms', 'p95 ms'))
+    for max_batch, max_wait in SETTINGS:
+        client = LimitedStubClient(latency=REQUEST_LATENCY, per_image_latency=IMAGE_LATENCY)
+        if max_batch == 1:
+            # batching 없이 요청마다 바로 호출
+            predict = client.predict
+        else:
+            batcher = InferenceBatcher(client, max_batch=max_batch, max_wait=max_wait, concurrency=ENDPOINT_WORKERS)
+            predict = batcher.predict
+
+        throughput, p50, p95 = measure(predict)
+        print('%9d %9.3f %9d %10.1f %9.1f %9.1f' % (max_batch, max_wait, client.calls, throughput, p50, p95))
@@ -0,0 +1,25 @@
+# 추론 요청 payload 형식별 크기, 인코딩 시간 측정 스크립트.
+# 사용법 : python manage.py runscript benchmark_inference_payload
+import statistics
+import time
+import cv2.cv2 as cv2
+
+from apps.api.inference import PAYLOAD_FORMATS
+from apps.api.utils import image_to_tensor
+
+SAMPLE_IMAGE_PATH = 'temp/sample_image.png'
+REPEAT = 20
+
+
+def run():
+    tensor = image_to_tensor(cv2.imread(SAMPLE_IMAGE_PATH))
+
+    print('%-6s %12s %12s' % ('format', 'bytes', 'encode ms'))
+    for payload_format, (content_type, encode, batchable) in PAYLOAD_FORMATS.items():
+        timings = []
+        for i in range(REPEAT):
+            started = time.perf_counter()
+            body = encode(tensor)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        print('%-6s %12d %12.2f' % (payload_format, len(body), statistics.median(timings)))
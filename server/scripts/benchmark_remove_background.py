@@ -0,0 +1,48 @@
+# remove_background 이미지당 시간, 최대 메모리 측정 스크립트.
+# 사용법 : python manage.py runscript benchmark_remove_background [--script-args <image dir>]
+# 기본 이미지 : temp/*.png, byte_to_image와 같이 가로 400px 이하로 줄여서 측정한다.
+import cv2.cv2 as cv2
+from pathlib import Path
+import statistics
+import time
+import tracemalloc
+
+from apps.api.utils import remove_background
+
+SAMPLE_IMAGE_DIR = 'temp'
+MAX_WIDTH = 400
+REPEAT = 50
+
+
+def load(path):
+    image = cv2.imread(str(path))
+    if image is not None and image.shape[1] > MAX_WIDTH:
+        ratio = float(MAX_WIDTH) / image.shape[1]
+        image = cv2.resize(image, (MAX_WIDTH, int(image.shape[0] * ratio)), interpolation=cv2.INTER_AREA)
+    return image
+
+
+def run(*args):
+    image_dir = Path(args[0] if args else SAMPLE_IMAGE_DIR)
+    paths = sorted(path for path in image_dir.iterdir() if path.suffix.lower() in ('.png', '.jpg', '.jpeg'))
+
+    print('%-30s %11s %9s %12s' % ('image', 'size', 'p50 ms', 'peak KB'))
+    for path in paths:
+        image = load(path)
+        if image is None:
+            continue
+
+        remove_background(image)
+        timings = []
+        for i in range(REPEAT):
+            started = time.perf_counter()
+            remove_background(image)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        tracemalloc.start()
+        remove_background(image)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        print('%-30s %11s %9.2f %12d' % (path.name, '%dx%d' % (image.shape[1], image.shape[0]),
+                                          statistics.median(timings), peak // 1024))
@@ -0,0 +1,79 @@
+# Weather 조회 속도 측정 스크립트.
+# 사용법 : python manage.py runscript benchmark_weather_lookup
+# 일주일 치(7일 x 8회 x 격자 수) 날씨를 넣고 측정한 뒤 rollback 하므로 DB에 남지 않는다.
+import datetime
+from django.conf import settings
+from django.db import connection, transaction
+import random
+import statistics
+import time
+
+from apps.api.location_registry import get_location_registry
+from apps.api.models import Weather
+from apps.api.weather_summary import get_weather_queryset
+
+DAYS = 7
+TIMES = [2, 5, 8, 11, 14, 17, 20, 23]
+LOOKUPS = 500
+
+
+def seed(start_date):
+    cells = get_location_registry().cells()
+    weathers = []
+    for day in range(DAYS):
+        date = start_date + datetime.timedelta(days=day)
+        for conv_time in TIMES:
+            for x, y in cells:
+                weathers.append(Weather(date=date, time=conv_time, x=x, y=y,
+                                        temp=20.0, sensible_temp=19.0, humidity=50,
+                                        wind_speed=1.5, precipitation=0.0))
+    Weather.objects.bulk_create(weathers, batch_size=settings.WEATHER_BULK_BATCH_SIZE)
+
+    return len(weathers)
+
+
+def lookup(location, start_date):
+    date = start_date + datetime.timedelta(days=random.randrange(DAYS - 1))
+    start_conv_date = date.strftime('%Y-%m-%d')
+    end_conv_date = (date + datetime.timedelta(days=1)).strftime('%Y-%m-%d')
+    start_conv_time = random.choice(TIMES)
+    end_conv_time = random.choice(TIMES)
+
+    weather_data = get_weather_queryset(
+        location, start_conv_date, end_conv_date, start_conv_time, end_conv_time)
+
+    return weather_data
+
+
+def run():
+    registry = get_location_registry()
+    start_date = datetime.date(2000, 1, 1)
+
+    with transaction.atomic():
+        started = time.perf_counter()
+        rows = seed(start_date)
+        print('seeded %d rows in %.2fs' % (rows, time.perf_counter() - started))
+
+        with connection.cursor() as cursor:
+            if connection.vendor == 'mysql':
+                cursor.execute('ANALYZE TABLE api_weather')
+            elif connection.vendor == 'sqlite':
+                cursor.execute('ANALYZE')
+
+        print(lookup(registry.codes()[0], start_date).explain())
+
+        latencies = []
+        for i in range(LOOKUPS):
+            location = random.choice(registry.codes())
+            started = time.perf_counter()
+            len(lookup(location, start_date))
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        latencies.sort()
+        print('lookups : %d' % LOOKUPS)
+        print('mean    : %.3f ms' % statistics.mean(latencies))
+        print('p50     : %.3f ms' % latencies[len(latencies) // 2])
+        print('p95     : %.3f ms' % latencies[int(len(latencies) * 0.95)])
+        print('max     : %.3f ms' % latencies[-1])
+
+        transaction.set_rollback(True)
@@ -0,0 +1,24 @@
+# lookbook 피드 주기적 갱신 스크립트.
+# 사용법 : python manage.py runscript refresh_lookbook
+# 웹 서버와 같은 CACHES(LOOKBOOK_CACHE_ALIAS, 공유 backend)를 써야 요청에서 갱신된 목록을 읽는다.
+from django.conf import settings
+import schedule
+import time
+
+from apps.api.lookbook import GENDERS, get_lookbook_feed
+
+
+def refresh():
+    feed = get_lookbook_feed()
+    for gender in GENDERS:
+        feed.refresh_in_background(gender)
+
+
+def run():
+    refresh()
+
+    schedule.every(settings.LOOKBOOK_REFRESH_INTERVAL).minutes.do(refresh)
+
+    while True:
+        schedule.run_pending()
+        time.sleep(1)